@@ -4,9 +4,8 @@ import pandas as pd
 file_lst = os.listdir("data/tourism/vanuatu/byorigin")
 file_lst = [os.getcwd() + "/data/tourism/vanuatu/byorigin/" + file for file in file_lst]
 
-combined = pd.DataFrame()
-for file in file_lst:
-    df = pd.read_csv(file)
-    combined = pd.concat([df, combined], axis=0)
+# Read every file first and concatenate once; growing the frame inside the
+# loop copies all previously read rows on each iteration.
+combined = pd.concat([pd.read_csv(file) for file in reversed(file_lst)], axis=0)
 
-combined.drop_duplicates()
+combined = combined.drop_duplicates()
@@ -1,5 +1,8 @@
 PROJECT_FOLDER_PATH = "/Users/czhang/Desktop/pacific-observatory/"
 SCRAPE_ALL = False
+# Listing pages re-scraped on incremental runs; older entries are taken
+# from the URL files saved by the previous run.
+INCREMENTAL_PAGES = 20
 COOKIES_PATH = "/Users/czhang/Library/Application Support/Google/Chrome/Profile 7/Cookies"
 
 # URL-related Information
@@ -25,8 +28,13 @@ ABC_AU_TOPIC_DICT = {
 }
 
 # PINA
-PINA_URLS = [f"https://pina.com.fj/category/news/page/{num}"
-             for num in range(1, 475)]
+PINA_PAGES = 474
+
+
+def pina_page_urls(pages=PINA_PAGES):
+    """Returns the URLs of the first `pages` PINA listing pages."""
+    return [f"https://pina.com.fj/category/news/page/{num}"
+            for num in range(1, pages + 1)]
 
 # Fiji
 # Fiji Sun
@@ -61,10 +69,15 @@ TIS_PAGE_URLS = [
 ]
 
 ## SIBC
-SIBC_PAGE_URLS = [
-    f"https://www.sibconline.com.sb/?s&post_type=post&paged={num}"
-    for num in range(1, 1335)
-]
+# The listing URLs are built on demand, so incremental runs (and scripts
+# that only import the settings) do not materialize all of them.
+SIBC_PAGES = 1334
+
+
+def sibc_page_urls(pages=SIBC_PAGES):
+    """Returns the URLs of the first `pages` SIBC listing pages."""
+    return [f"https://www.sibconline.com.sb/?s&post_type=post&paged={num}"
+            for num in range(1, pages + 1)]
 
 # Pupua New Guinea
 # Post Courier
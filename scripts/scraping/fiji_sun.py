@@ -5,14 +5,13 @@ sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 import numpy as np
 from src.scraper.scrape import WebScraper
-
-SCRAPE_ALL = True
+from src.scraper.utils import filter_new_urls, save_csv
 
 # Specify the host and saving directory
 target_dir = sys.path[0] + "data/text/fiji/"
 
 # Scrape news URLs
-fs = WebScraper(parser="html.parser")
+fs = WebScraper(parser="lxml")
 fs_news_urls_raw = fs.scrape_urls(FIJI_SUN_URLS,
                                   "article-header",
                                   speed_up=True)
@@ -27,20 +26,24 @@ for page in fs_news_urls_raw:
         news_info.append([title, url])
 
 news_info_df = pd.DataFrame(news_info, columns=["title", "url"])
-news_info_df["date"] = news_info_df["url"].apply(lambda x: "-".join(x.split("/")[3:6]))
+news_info_df["date"] = news_info_df["url"].str.split("/").str[3:6].str.join("-")
 news_info_df["date"] = pd.to_datetime(news_info_df["date"])
 news_info_df = news_info_df.drop_duplicates().reset_index(drop=True)
 news_info_df.to_csv(target_dir+"fiji_sun_urls.csv", encoding="utf-8")
 
 # Scrape News, Dates and Tags
-previous_news_df = pd.read_csv(target_dir+"fiji_sun_news.csv").drop("Unnamed: 0", axis=1)
+previous_news_df = pd.read_csv(target_dir+"fiji_sun_news.csv", index_col=0)
+previous_news_df["date"] = pd.to_datetime(previous_news_df["date"])
 
 if not SCRAPE_ALL:
-    previous_urls = set(previous_news_df["url"])
-    current_urls = set(news_info_df["url"])
-    news_urls = list(current_urls - previous_urls)
+    news_urls = filter_new_urls(news_info_df["url"], previous_news_df["url"])
 else:
     news_urls = news_info_df.url.tolist()
+
+# Nothing new since the last run: leave the news file untouched.
+if not news_urls:
+    print("No new articles to scrape.")
+    sys.exit(0)
 news_raw = fs.scrape_urls(news_urls, ["shortcode-content", "tag-block"],  True)
 news_content = []
 for i in news_raw:
@@ -57,12 +60,13 @@ for i in news_raw:
     news_content.append([url, text, tags])
 
 news = pd.DataFrame(news_content, columns=["url", "news", "tags"])
-news["date"] = news["url"].apply(lambda x: "-".join(x.split("/")[3:6]))
+news = news.merge(news_info_df[["url", "date"]].drop_duplicates(subset="url"),
+                  how="left", on="url")
 news["not_full"] = news["news"].str.contains("https://eedition.fijisun.com.fj/subscriptionplans")
 if not SCRAPE_ALL:
     news = pd.concat([news, previous_news_df], axis=0)
     news = (news.sort_values(by="date", ascending=False)
                 .reset_index(drop=True))
-    news.to_csv(target_dir+"fiji_sun_news.csv", encoding="utf-8")
+    save_csv(news, target_dir+"fiji_sun_news.csv")
 else: 
     news.to_csv(target_dir+"fiji_sun_news.csv", encoding="utf-8")
\ No newline at end of file
@@ -1,13 +1,12 @@
 import os
 import sys
 import pandas as pd
-import re
 import numpy as np
 from config import (PROJECT_FOLDER_PATH, MATANGI_PAGE_URLS,
                     MATANGI_PAGE_URLS_ELEMENTS, SCRAPE_ALL)
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 from src.scraper.scrape import WebScraper
-from src.scraper.utils import check_latest_date, handle_mixed_dates
+from src.scraper.utils import check_latest_date, handle_mixed_dates, append_news
 
 target_dir = sys.path[0] + "data/text/tonga/"
 if not os.path.exists(target_dir):
@@ -24,29 +23,26 @@ urls_info = {
     "tag": [],
     "location": [],
 }
-for page in urls_raw:
-    page_url, page_raw = page[0], page[1]
-    urls_info["title"].extend([i.text for i in page_raw[0]])
-    urls_info["url"].extend([i.find("a")["href"] for i in page_raw[0]])
-    urls_info["date"].extend([i.text for i in page_raw[2]])
-    urls_info["tag"].extend([i.text for i in page_raw[1]])
-    urls_info["location"].extend([i.text.strip() for i in page_raw[3]])
+titles, urls = urls_info["title"], urls_info["url"]
+for _, (title_elems, tag_elems, date_elems, location_elems) in urls_raw:
+    # One pass over the title cells yields both the title and the full URL.
+    for i in title_elems:
+        titles.append(i.text)
+        urls.append("https://matangitonga.to" + i.find("a")["href"])
+    urls_info["date"].extend(i.text for i in date_elems)
+    urls_info["tag"].extend(i.text for i in tag_elems)
+    urls_info["location"].extend(i.text.strip() for i in location_elems)
 
 mtg_urls = pd.DataFrame(urls_info)
-mtg_urls["url"] = [f"https://matangitonga.to{url}" for url in mtg_urls.url]
 
-def date_extractor(date, pattern=r"\b\d{1,2}\s\w+\s\d{4}\b"):
-    if len(date.strip()) != 0:
-        try: 
-            formatted_date = re.findall(pattern, date)[0]
-            return formatted_date
-        except:
-            return date
-    else:
-        return np.NAN
-
-mtg_urls["date"] = pd.to_datetime(mtg_urls["date"].apply(lambda x: date_extractor(x)),
-                                  format="mixed")
+# Pull "5 March 2024"-style dates out of the publication cells in one
+# vectorized pass; cells without one are parsed as they are, blanks become NaT.
+raw_dates = mtg_urls["date"]
+mtg_urls["date"] = pd.to_datetime(
+    raw_dates.str.extract(r"(\b\d{1,2}\s\w+\s\d{4}\b)", expand=False)
+             .fillna(raw_dates)
+             .where(raw_dates.str.strip() != ""),
+    format="mixed")
 
 print_urls = mtg_urls["url"].tolist()
 print_urls_raw = mtg.scrape_urls(print_urls, ["print-page"], speed_up=True)
@@ -65,9 +61,9 @@ mtg_urls = mtg_urls.merge(urls_map_df, how="left", on="url")
 mtg_urls.to_csv(f"{target_dir}matangi_urls.csv", encoding="utf-8")
 
 #
-previous_news_df = pd.read_csv(target_dir + "matangi_news.csv").drop("Unnamed: 0", axis=1)
 latest_date = check_latest_date(target_dir + "matangi_news.csv")
-mtg_urls["tonga"] = mtg_urls["location"].apply(lambda x: "tonga" in str(x).lower())
+mtg_urls["tonga"] = mtg_urls["location"].str.contains("tonga", case=False,
+                                                     regex=False, na=False)
 
 if not SCRAPE_ALL: 
     news_urls = mtg_urls[(mtg_urls["tonga"] == True) & (mtg_urls["date"] >= latest_date)]["print_url"].tolist()
@@ -87,11 +83,8 @@ for raw in news_raw:
 news_df = pd.DataFrame(news_info, columns=["print_url", "news"])
 news_df = (news_df.merge(mtg_urls, how="left", on="print_url"))
 news_df = news_df[["url", "date", "title", "news", "tag"]]
+news_df["date"] = pd.to_datetime(news_df["date"])
 if not SCRAPE_ALL:
-    news_df = (pd.concat([previous_news_df, news_df], axis=0)
-                 .reset_index(drop=True))
-    news_df["date"] = pd.to_datetime(news_df["date"])
-    news_df.to_csv(target_dir+"matangi_news.csv", encoding="utf-8")
+    append_news(news_df, target_dir+"matangi_news.csv")
 else:
-    news_df["date"] = pd.to_datetime(news_df["date"])
     news_df.to_csv(target_dir+"matangi_news.csv", encoding="utf-8")
\ No newline at end of file
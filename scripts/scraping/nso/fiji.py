@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -38,7 +39,11 @@ while start < 136:
         page_lst.append(url)
         start += 1
 
-# Download pdf files
-for url in download_urls:
+# Download pdf files, a few at a time
+def download(url):
     path = os.getcwd() + "/data/tourism/fiji/scraping/updated/" + url.split("/")[-1]
     download_files(url, path=path)
+
+
+with ThreadPoolExecutor(max_workers=4) as executor:
+    list(executor.map(download, download_urls))
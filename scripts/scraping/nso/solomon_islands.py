@@ -1,9 +1,14 @@
 import os
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 from ..config import PROJECT_FOLDER_PATH
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from src.scraper.scrape import SeleniumScraper
 from src.scraper.utils import download_files
 
@@ -11,6 +16,7 @@ from src.scraper.utils import download_files
 KEYWORD = "cpi"
 sb_nso_url = f"https://statistics.gov.sb/documents/?q={KEYWORD}"
 download_xpath = "//a[@class='downloadlink wpfd_downloadlink']"
+next_page_xpath = "//a[@class='next page-numbers']"
 chromedriver_path = sys.path[0] + "/scripts/chromedriver"
 SAVED_PATH = sys.path[0] + "/data/official_statistics/solomon_islands/cpi/"
 
@@ -22,19 +28,38 @@ def scrape_sb_nso(url: str,
     """
     urls = []
     scraper = SeleniumScraper(driver_path=driver_path,
-                              download_path=download_path)
+                              download_path=download_path,
+                              failed_log_path=download_path + "failed_urls.csv")
     scraper.start_driver()
-    scraper.driver.get(sb_nso_url)
-    while True:
-        try:
-            download_elems = scraper.perform_search(download_xpath)
+    try:
+        scraper.driver.get(sb_nso_url)
+        while True:
+            try:
+                download_elems = scraper.perform_search(download_xpath)
+            except TimeoutException as e:
+                scraper.add_failed_url(scraper.driver.current_url, str(e))
+                break
             urls.extend(
                 [elem.get_attribute("href") for elem in download_elems])
-            next_page_button = scraper.perform_search(
-                "//a[@class='next page-numbers']")[0]
-            next_page_button.click()
-        except:
-            break
+            # The results have loaded, so a missing "next" link means this is
+            # the last page; find_elements returns at once instead of waiting
+            # for the search timeout.
+            next_page_buttons = scraper.driver.find_elements(By.XPATH,
+                                                             next_page_xpath)
+            if not next_page_buttons:
+                break
+            current_url = scraper.driver.current_url
+            next_page_buttons[0].click()
+            # A page that never replaces the old one ends pagination with
+            # the URLs collected so far.
+            try:
+                WebDriverWait(scraper.driver, 20).until(
+                    EC.staleness_of(next_page_buttons[0]))
+            except TimeoutException as e:
+                scraper.add_failed_url(current_url, str(e))
+                break
+    finally:
+        scraper.close_driver()
     return urls
 
 month_mapping = {
@@ -63,14 +88,17 @@ month_mapping = {
     'dec': '12'
 }
 
+# Built once from the month names above rather than on every call.
+MONTH_REGEX = re.compile(
+    r"(?P<month>" + "|".join(month_mapping.keys()) +
+    r")(?=[-_\.])(.*?)(?P<year>\d{4})", re.IGNORECASE)
+
 
 def parse_file_name(file_name):
     """
     The function is to extract yyyymm from a specific filename.
     """
-    regex = r"(?P<month>" + "|".join(
-        month_mapping.keys()) + r")(?=[-_\.])(.*?)(?P<year>\d{4})"
-    match = re.search(regex, file_name, re.IGNORECASE)
+    match = MONTH_REGEX.search(file_name)
     if match:
         month = match.group("month").lower()
         year = match.group("year")
@@ -85,7 +113,12 @@ cpi_urls_df = pd.DataFrame(cpi_urls, columns=["url"])
 cpi_urls_df["filename"] = cpi_urls_df["url"].apply(parse_file_name)
 cpi_urls_df.to_csv(f"{SAVED_PATH}cpi_urls_backup.csv", encoding="utf-8")
 
-for url in cpi_urls:
-    filename = url.split("/")[-1]
-    parsed_filename = parse_file_name(filename)
+
+def download(url):
+    parsed_filename = parse_file_name(url.split("/")[-1])
     download_files(url, path=f"{SAVED_PATH}{parsed_filename}.pdf")
+
+
+# The PDFs are independent, so a few are downloaded at a time.
+with ThreadPoolExecutor(max_workers=4) as executor:
+    list(executor.map(download, cpi_urls))
@@ -4,12 +4,27 @@ import os
 import sys
 sys.path.insert(0, "/Users/czhang/Desktop/pacific-observatory/")
 import pandas as pd
-import glob
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+CATEGORY_XPATH = "//a[@class='wpfdcategory catlink']"
+DOWNLOAD_XPATH = "//a[@class='downloadlink wpfd_downloadlink']"
+
+
+def download_status(download_dir):
+    """
+    Returns the number of files in `download_dir` and whether any of them
+    is still a partial Chrome download, from a single directory scan.
+    """
+    if not os.path.isdir(download_dir):
+        return 0, False
+    with os.scandir(download_dir) as entries:
+        names = [entry.name for entry in entries]
+    return len(names), any(name.endswith(".crdownload") for name in names)
 
 
 # 12 Yrs Data from 2010 to 2021
@@ -18,7 +33,8 @@ while i < 12:
     chrome_options = webdriver.ChromeOptions()
 
     # Specify the downloading path
-    prefs = {'download.default_directory': os.getcwd() + '/data/tonga'}
+    download_dir = os.getcwd() + '/data/tonga'
+    prefs = {'download.default_directory': download_dir}
     chrome_options.add_experimental_option('prefs', prefs)
     driver = webdriver.Chrome(os.getcwd() + "/chromedriver", chrome_options=chrome_options)
 
@@ -27,27 +43,52 @@ while i < 12:
 
     # Each Year's folder button
     links =  WebDriverWait(driver, 5).until(
-            EC.presence_of_all_elements_located((By.XPATH, "//a[@class='wpfdcategory catlink']")))
+            EC.presence_of_all_elements_located((By.XPATH, CATEGORY_XPATH)))
+    year_count = len(links)
 
     # Click the button
     links[i].click()
 
-    # Explicit Wait for elements loading
-    time.sleep(5)
+    # Wait until the clicked folder has rendered: the list of year folders is
+    # replaced by the folder's own sub-folders. A folder whose view keeps the
+    # same number of category links just waits out the timeout, like the old
+    # fixed sleep.
+    try:
+        WebDriverWait(driver, 10).until(
+            lambda d: len(d.find_elements(By.XPATH, CATEGORY_XPATH)) != year_count)
+    except TimeoutException:
+        pass
 
     # Check whether sub-folder exists (For 2016 and 2017)
-    child_button = driver.find_elements(By.XPATH, "//a[@class='wpfdcategory catlink']")
+    child_button = driver.find_elements(By.XPATH, CATEGORY_XPATH)
     if len(child_button) > 1:
+        parent_downloads = driver.find_elements(By.XPATH, DOWNLOAD_XPATH)
         child_button[-1].click()
+        # Do not collect the parent folder's links before they are replaced
+        if parent_downloads:
+            WebDriverWait(driver, 10).until(EC.staleness_of(parent_downloads[0]))
 
     # Extract and click all the downloading buttons
     download_buttons = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.XPATH, "//a[@class='downloadlink wpfd_downloadlink']")))
+            EC.presence_of_all_elements_located((By.XPATH, DOWNLOAD_XPATH)))
 
+    downloaded, _ = download_status(download_dir)
+    expected = downloaded + len(download_buttons)
     for button in download_buttons:
         button.click()
 
-    # Explicit Wait for the downloading to be finished
-    time.sleep(5)
-    driver.close()
+    # Wait until every file has landed and no partial downloads are left;
+    # each poll lists the directory once.
+    def downloads_finished(_):
+        count, pending = download_status(download_dir)
+        return not pending and count >= expected
+
+    # A failed or stalled download is logged and the remaining years are
+    # still scraped.
+    try:
+        WebDriverWait(driver, 60, poll_frequency=0.5).until(downloads_finished)
+    except TimeoutException:
+        print(f"Downloads for folder {i} did not finish within 60s.")
+    finally:
+        driver.close()
     i += 1
\ No newline at end of file
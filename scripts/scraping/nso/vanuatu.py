@@ -3,6 +3,7 @@
 import os
 import pandas as pd
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -35,6 +36,12 @@ for download in downloads:
 
 
 
-for url in download_urls:
+# Download a few files at a time; the shared urllib3 pool keeps the
+# connections to the statistics office alive between files.
+def download(url):
     path = os.getcwd() + "/data/vanuatu/" + url.split("/")[-1]
     download_files(url, path=path)
+
+
+with ThreadPoolExecutor(max_workers=4) as executor:
+    list(executor.map(download, download_urls))
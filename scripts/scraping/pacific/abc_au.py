@@ -3,64 +3,86 @@ import sys
 from ..config import PROJECT_FOLDER_PATH, ABC_AU_TOPIC_DICT, SCRAPE_ALL
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
-import numpy as np
-import json
+from concurrent.futures import ThreadPoolExecutor
 from src.scraper.scrape import WebScraper
-from src.scraper.utils import check_latest_date
+from src.scraper.utils import save_csv, flatten_records
+
+
+# One scraper, shared by every topic and by both the API and article passes,
+# so connections to abc.net.au stay alive throughout the run.
+scraper = WebScraper(parser="lxml")
+
+# API fields flattened by pd.json_normalize, and the column each one becomes.
+ABC_AJAX_FIELDS = {
+    "link.to": "url",
+    "title.children": "title",
+    "timestamp.dates.firstPublished": "date",
+    "contentUri": "media_type",
+}
 
 
 def scrape_ajax_abc(document_id: int,
                     size: int = 1000,
                     offset: int = 0
-                    ) -> list:
+                    ) -> pd.DataFrame:
 
-    scraper = WebScraper()
-    output = []
+    pages = []
 
     total = 5000
     while offset < total:
         ajax_url = f"https://www.abc.net.au/news-web/api/loader/topicstories?name=PaginationArticles&documentId={document_id}&offset={offset}&size={size}"
-        content = scraper.request_url(ajax_url, timeout=30)
-        data = json.loads(content)
+        data = scraper.request_json(ajax_url, timeout=30)
         total = data["pagination"]["total"]
-        for i in data["collection"]:
-            link = i["link"]["to"]
-            try:
-                title = i["title"]["children"]
-                date = i["timestamp"]["dates"]["firstPublished"]
-                media_type = i["contentUri"].split("//")[-1].split("/")[0]
-                output.append([link, title, date, media_type])
-            except:
-                output.append([link, np.NAN, np.NAN, np.NAN]) 
+        # Flatten each API page as it arrives and keep only the mapped fields,
+        # so the raw records are not all held until the end; missing fields
+        # become NaN instead of being caught record by record.
+        pages.append(flatten_records(data["collection"], ABC_AJAX_FIELDS))
         offset += size
+
+    # The columns stay object dtype, so an empty topic flows through as an
+    # empty frame.
+    output = pd.concat(pages, axis=0, ignore_index=True)
+    output["media_type"] = (output["media_type"].str.split("//").str[-1]
+                                                .str.split("/").str[0])
     return output
 
 
+# Page through every topic's API concurrently; each topic is paginated
+# sequentially, so topics are the unit of parallelism.
+with ThreadPoolExecutor(max_workers=4) as executor:
+    topic_outputs = dict(zip(ABC_AU_TOPIC_DICT,
+                             executor.map(scrape_ajax_abc, ABC_AU_TOPIC_DICT)))
+
+# URL files are written in the background while the articles are scraped.
+writer = ThreadPoolExecutor(max_workers=1)
+url_writes = []
 for key, name in ABC_AU_TOPIC_DICT.items():
     ## Scrape URLs
-    output = scrape_ajax_abc(
-        document_id = key
-    )
-    df = (pd.DataFrame(output, columns=["url", "title", "date", "media_type"])
-            .drop_duplicates())
-    df["url"] = ["https://www.abc.net.au" + i for i in df.url]
+    df = topic_outputs[key].drop_duplicates()
+    df["url"] = "https://www.abc.net.au" + df["url"]
     df["date"] = pd.to_datetime(df["date"])
     target_dir = sys.path[0] + f"data/text/{name}/"
-    df.to_csv(target_dir + name + "_abc_urls.csv", encoding="utf-8")
+    url_writes.append(writer.submit(df.to_csv, target_dir + name + "_abc_urls.csv",
+                                    encoding="utf-8"))
 
     ## Check gaps between scrapings
     news_filepath = target_dir + name + "_abc_news.csv"
     if os.path.exists(news_filepath): 
-        previous_news_df = pd.read_csv(news_filepath).drop("Unnamed: 0", axis=1)
+        previous_news_df = pd.read_csv(news_filepath, index_col=0)
         previous_news_df["date"] = pd.to_datetime(previous_news_df["date"])
-        latest_date = check_latest_date(target_dir + name + "_abc_news.csv")
+        # The archive is already loaded; no need to read it again for its dates.
+        latest_date = previous_news_df["date"].max()
         urls = df[(df.date > latest_date) & (df.media_type == "article")]["url"].tolist()
     else:
         SCRAPE_ALL=True
         urls = df[df.media_type == "article"]["url"].tolist()
 
+    # Nothing new for this topic: keep its news file as it is.
+    if not urls:
+        print(f"No new articles for {name}.")
+        continue
+
     ## Scrape articles
-    scraper = WebScraper(parser="html.parser")
     expressions = ['RelatedTopics_topicsList__R3TEv', 'paragraph_paragraph___QITb']
     print(f"{name}'s scraping work has started.")
     news_output = scraper.scrape_urls(urls, expressions, speed_up=True)
@@ -81,4 +103,9 @@ for key, name in ABC_AU_TOPIC_DICT.items():
         news_df = (pd.concat([previous_news_df, news_df], axis=0)
                      .sort_values(by="date", ascending=False)
                      .reset_index(drop=True))
-        news_df.to_csv(target_dir + name + "_abc_news.csv", encoding="utf-8")
\ No newline at end of file
+        save_csv(news_df, news_filepath)
+
+# Surface any failed URL file write, as a direct to_csv call would.
+for url_write in url_writes:
+    url_write.result()
+writer.shutdown(wait=True)
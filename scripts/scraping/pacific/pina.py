@@ -1,77 +1,88 @@
 import os
 import sys
-from ..config import PROJECT_FOLDER_PATH, PINA_URLS, SCRAPE_ALL
+from ..config import PROJECT_FOLDER_PATH, pina_page_urls, SCRAPE_ALL, INCREMENTAL_PAGES
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 import numpy as np
+from lxml import etree
 from src.scraper.scrape import WebScraper
+from src.scraper.utils import (merge_previous_urls, filter_new_urls, save_csv,
+                               parse_dates, merge_sorted_frames)
 
 target_dir = sys.path[0] + "data/text/pacific/"
+urls_path = target_dir + "pac_after_2020_urls.csv"
 
-scraper = WebScraper("html.parser")
-pages_raw = scraper.scrape_urls(PINA_URLS,
-                                ["td_module_10 td_module_wrap td-animation-stack"],
-                                speed_up=True)
-urls_info = []
-for page in pages_raw:
-    items = page[1][0]
-    for i in items:
-        title = (i.find("h3").text)
-        url = i.find("a")["href"]
-        date = i.find(class_="td-post-date").text
-        tag = i.find(class_="td-post-category").text
-        urls_info.append([url, title, date])
+# Listing fields, compiled once and evaluated on every module of every page.
+MODULE_XPATH = "//*[normalize-space(@class)='td_module_10 td_module_wrap td-animation-stack']"
+TITLE_XPATH = etree.XPath("string(.//h3)", smart_strings=False)
+URL_XPATH = etree.XPath("string((.//a)[1]/@href)", smart_strings=False)
+DATE_XPATH = etree.XPath(
+    "string(.//*[contains(concat(' ', normalize-space(@class), ' '), ' td-post-date ')])",
+    smart_strings=False)
 
-urls_df = pd.DataFrame(urls_info, columns=["url", "title", "date"])
-urls_df["date"] = pd.to_datetime(urls_df["date"], format="mixed")
+# Article fields: paragraph text nodes in one call, and the tag list items.
+CONTENT_XPATH = "//*[normalize-space(@class)='td-post-content tagdiv-type']"
+TAGS_XPATH = "//*[normalize-space(@class)='td-post-source-tags']"
+PARAGRAPH_TEXT_XPATH = etree.XPath(".//p//text()", smart_strings=False)
+TAG_ITEM_XPATH = etree.XPath(".//li")
+TEXT_XPATH = etree.XPath("string()", smart_strings=False)
+
+# One scraper, and so one pooled session, serves both passes.
+scraper = WebScraper("xpath")
+page_urls = pina_page_urls() if SCRAPE_ALL else pina_page_urls(INCREMENTAL_PAGES)
+pages_raw = scraper.iter_scrape_urls(page_urls, MODULE_XPATH)
+records = ((URL_XPATH(i), TITLE_XPATH(i), DATE_XPATH(i))
+           for _, items in pages_raw for i in items)
+urls_df = pd.DataFrame.from_records(records, columns=["url", "title", "date"])
+# Pinned posts repeat across listing pages.
+urls_df = urls_df.drop_duplicates(subset="url")
+if not SCRAPE_ALL:
+    urls_df = merge_previous_urls(urls_df, urls_path)
+urls_df["date"] = parse_dates(urls_df["date"])
 urls_df = (urls_df.sort_values(by="date", ascending=False)
            .reset_index(drop=True))
-urls_df.to_csv(target_dir + "pac_after_2020_urls.csv", encoding="utf-8")
+urls_df.to_csv(urls_path, encoding="utf-8")
 
 
-previous_news_df = (pd.read_csv(target_dir + "pac_news_after_2020.csv")
-                    .drop("Unnamed: 0", axis=1))
+previous_news_df = pd.read_csv(target_dir + "pac_news_after_2020.csv",
+                               index_col=0)
 previous_news_df["date"] = pd.to_datetime(
     previous_news_df["date"], format="mixed")
 if not SCRAPE_ALL:
-    previous_urls = set(previous_news_df["url"])
-    current_urls = set(urls_df["url"])
-    urls_to_scrape = list(current_urls - previous_urls)
+    urls_to_scrape = filter_new_urls(urls_df["url"], previous_news_df["url"])
 else:
     urls_to_scrape = urls_df["url"].tolist()
 
-news_raw = scraper.scrape_urls(urls_to_scrape,
-                               ["td-post-content tagdiv-type", "td-post-source-tags"],
-                               speed_up=True)
+# Consume pages as they complete rather than holding every parsed page.
+news_raw = scraper.iter_scrape_urls(urls_to_scrape, [CONTENT_XPATH, TAGS_XPATH])
 
 news_list = []
 for i in news_raw:
     url = i[0]
-    news = "".join(p.text for p in i[1][0][0].find_all("p"))
-    tags = "".join(i.text.lower() + " " for i in i[1][1][0].find_all("li")
-                   if i.text.lower() != "tags")
+    news = "".join(PARAGRAPH_TEXT_XPATH(i[1][0][0]))
+    # Each tag's text is extracted and lower-cased once.
+    tag_texts = (TEXT_XPATH(li).lower() for li in TAG_ITEM_XPATH(i[1][1][0]))
+    tags = "".join(tag + " " for tag in tag_texts if tag != "tags")
     news_list.append([url, news, tags])
 
 news_df = pd.DataFrame(news_list, columns=["url", "news", "tags"])
 news_df = news_df.merge(urls_df, how="left", on="url")
 
 if not SCRAPE_ALL:
-    news_df = pd.concat([news_df, previous_news_df], axis=0)
-    news_df = news_df.sort_values(by="date", ascending=False).reset_index(drop=True)
-    news_df.to_csv(target_dir + "pac_after_2020.csv", encoding="utf-8")
+    news_df = merge_sorted_frames([news_df, previous_news_df])
+    save_csv(news_df, target_dir + "pac_after_2020.csv")
 else:
     news_df.to_csv(target_dir + "pac_after_2020.csv", encoding="utf-8")
 
 
 # Additional measures to combine before and after 2020
-pac_before = pd.read_csv(
-    target_dir + "pac_news_before_2021.csv").drop("Unnamed: 0", axis=1)
+# Only the combined columns are parsed; the archive index is rebuilt below.
+pac_before = pd.read_csv(target_dir + "pac_news_before_2021.csv",
+                         usecols=["date", "title", "news"])
 pac_before["title"] = pac_before["title"].str.lower().str.strip()
 news_df["title"] = news_df["title"].str.lower().str.strip()
-duplicated_sets = (
-    set(pac_before["title"]).intersection(set(news_df["title"])))
-pac_before = pac_before[~pac_before.title.isin(
-    duplicated_sets)][["date", "title", "news"]]
+# Drop older copies of articles that are also in the recent scrape.
+pac_before = pac_before[~pac_before.title.isin(news_df["title"])]
 pac = pd.concat([pac_before, news_df[["date", "title", "news"]]], axis=0)
 pac["date"] = pd.to_datetime(pac["date"])
 pac = pac.sort_values(by="date", ascending=False).reset_index(drop=True)
@@ -4,7 +4,8 @@ from ..config import PROJECT_FOLDER_PATH
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import numpy as np
 import pandas as pd
-from src.scraper.utils import check_latest_date
+from lxml import etree
+from src.scraper.utils import check_latest_date, save_csv, parse_dates, merge_sorted_frames
 from src.scraper.scrape import WebScraper
 
 # Basic Setup
@@ -12,52 +13,66 @@ host_url = "https://www.rnz.co.nz"
 countries = ["Solomon Islands", "Samoa", "Fiji", "Papua New Guinea"]
 scrape_all = False
 
+# Listing entries are read straight off the lxml tree; the field
+# expressions are compiled once for every entry of every page, and return
+# plain strings that do not keep the page tree alive.
+DIGEST_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' o-digest__detail ')]"
+TITLE_XPATH = etree.XPath("string(.//h3)", smart_strings=False)
+DATE_XPATH = etree.XPath("string(.//span)", smart_strings=False)
+HREF_XPATH = etree.XPath("string((.//a)[1]/@href)", smart_strings=False)
+# Article bodies: every text node of every paragraph, gathered in one call.
+ARTICLE_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' article__body ')]"
+PARAGRAPH_TEXT_XPATH = etree.XPath(".//p//text()", smart_strings=False)
+
+# One scraper serves the listing and article passes of every country,
+# keeping its connections to rnz.co.nz alive throughout.
+scraper = WebScraper(parser="xpath")
+
 for country in countries:
     # Filepath Setup
-    url_filepath = country.replace(" ", "_").lower() + "_rnz_urls.csv"
-    target_dir = sys.path[0] + "/data/text/" + \
-        country.replace(" ", "_").lower() + "/"
-    news_filepath = country.lower().replace(" ", "_") + "_rnz_news.csv"
+    country_slug = country.replace(" ", "_").lower()
+    target_dir = sys.path[0] + "/data/text/" + country_slug + "/"
+    url_filepath = target_dir + country_slug + "_rnz_urls.csv"
+    news_filepath = target_dir + country_slug + "_rnz_news.csv"
 
     # Scrping URL Setup
     country_base_url = host_url + "/tags/" + str(country) + "?page="
     country_urls = [country_base_url + str(i) for i in range(1, 500)]
 
-    scraper = WebScraper(parser="html.parser")
-    data = scraper.scrape_urls(country_urls, "o-digest__detail")
-
-    output = []
-    for pg in data:
-        for i in pg:
-            output.append([i.find("h3").text,
-                           i.find("span").text,
-                           i.find("a")["href"]])
+    # Pages stream straight into the frame as records; neither the parsed
+    # pages nor an intermediate row list are kept around.
+    pages = scraper.iter_scrape_urls(country_urls, DIGEST_XPATH)
+    records = ((TITLE_XPATH(i), DATE_XPATH(i), HREF_XPATH(i))
+               for _, pg in pages for i in pg)
+    rnz_df = pd.DataFrame.from_records(
+        records, columns=["title", "date", "url"]).drop_duplicates()
+    # Programme pages carry "programmes" as their third path segment.
+    rnz_df["news"] = rnz_df["url"].str.split("/", n=3).str[2] != "programmes"
+    rnz_df["date"] = parse_dates(rnz_df["date"])
 
-    rnz_df = pd.DataFrame(
-        output, columns=["title", "date", "url"]).drop_duplicates()
-    rnz_df["news"] = rnz_df["url"].apply(
-        lambda x: x.split("/")[2] != "programmes")
-    rnz_df["date"] = pd.to_datetime(rnz_df["date"])
-
-    rnz_df["url"] = [host_url + str(url) for url in rnz_df.url]
+    rnz_df["url"] = host_url + rnz_df["url"]
 
     # Save url files
-    rnz_df.to_csv(target_dir + url_filepath, encoding="utf-8")
+    rnz_df.to_csv(url_filepath, encoding="utf-8")
 
     if not scrape_all:
-        latest_scraped_date = check_latest_date(target_dir + news_filepath)
+        latest_scraped_date = check_latest_date(news_filepath)
         news_urls = rnz_df[(rnz_df.date > latest_scraped_date) & (
             rnz_df.news == True)]["url"].tolist()
     else:
         news_urls = rnz_df[rnz_df.news == True]["url"].tolist()
 
-    scraper = WebScraper(parser="html.parser")
+    # Nothing new for this country: keep its news file as it is.
+    if not news_urls:
+        print(f"No new articles for {country}.")
+        continue
+
     nested_data = scraper.scrape_urls(
-        news_urls, "article__body", speed_up=True)
+        news_urls, ARTICLE_XPATH, speed_up=True)
     news_output = []
     for url, i in nested_data:
         try:
-            text = "".join(p.text for p in i[0].find_all("p"))
+            text = "".join(PARAGRAPH_TEXT_XPATH(i[0]))
             news_output.append([url, text])
         except Exception as e:
             print(f"An Error has occured: {e}.")
@@ -66,12 +81,9 @@ for country in countries:
     country_news_df = pd.DataFrame(news_output, columns=["url", "news"])
     country_news_df = country_news_df.merge(rnz_df[["url", "date"]], how="left", on="url")
     if not scrape_all:
-        previous_news_df = pd.read_csv(
-            target_dir + news_filepath).drop("Unnamed: 0", axis=1)
+        previous_news_df = pd.read_csv(news_filepath, index_col=0)
         previous_news_df["date"] = pd.to_datetime(previous_news_df["date"])
-        latest_news_df = (pd.concat([previous_news_df, country_news_df], axis=0)
-                            .sort_values(by="date", ascending=False)
-                            .reset_index(drop=True))
-        latest_news_df.to_csv(target_dir + news_filepath, encoding="utf-8")
+        latest_news_df = merge_sorted_frames([previous_news_df, country_news_df])
+        save_csv(latest_news_df, news_filepath)
     else:
-        country_news_df.to_csv(target_dir + news_filepath, encoding="utf-8")
+        country_news_df.to_csv(news_filepath, encoding="utf-8")
@@ -1,14 +1,19 @@
 import os
 import sys
-from ..config import PROJECT_FOLDER_PATH
+from ..config import PROJECT_FOLDER_PATH, SCRAPE_ALL, INCREMENTAL_PAGES
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 from src.scraper.scrape import *
+from src.scraper.utils import merge_previous_urls, filter_new_urls, save_csv
 
 
 target_dir = sys.path[0] + "data/text/png/"
+urls_path = target_dir + "png_business_urls.csv"
+news_path = target_dir + "png_business_news.csv"
 host_url = "https://www.pngbusinessnews.com/"
 news_urls = [host_url + f"articles?page={i}" for i in range(1, 93)]
+if not SCRAPE_ALL:
+    news_urls = news_urls[:INCREMENTAL_PAGES]
 
 pngb = WebScraper("html.parser")
 news_urls_raw = pngb.scrape_urls(
@@ -24,12 +29,24 @@ for page in news_urls_raw:
         news_info.append([url, date, title])
 
 urls_df = pd.DataFrame(news_info, columns=["url", "date", "title"])
-urls_df["date"] = pd.to_datetime(urls_df["date"])
-urls_df.to_csv(target_dir+"png_business_urls.csv", encoding="utf-8")
+if not SCRAPE_ALL:
+    urls_df = merge_previous_urls(urls_df, urls_path)
+# Fresh listing dates and ISO dates from the saved URL file are mixed here.
+urls_df["date"] = pd.to_datetime(urls_df["date"], format="mixed")
+urls_df.to_csv(urls_path, encoding="utf-8")
 
-# Re-read the
-urls_df = pd.read_csv(target_dir+"png_business_urls.csv")
-urls_to_scrape = urls_df.url.tolist()
+# Articles already in the archive are not fetched again.
+if not SCRAPE_ALL and os.path.exists(news_path):
+    previous_news_df = pd.read_csv(news_path, index_col=0)
+    previous_news_df["date"] = pd.to_datetime(previous_news_df["date"])
+    urls_to_scrape = filter_new_urls(urls_df["url"], previous_news_df["url"])
+else:
+    previous_news_df = None
+    urls_to_scrape = urls_df.url.tolist()
+
+if not urls_to_scrape:
+    print("No new articles to scrape.")
+    sys.exit(0)
 
 # content div class_  grid-x margin-bottom-1 article-content
 news_contents = pngb.scrape_urls(
@@ -44,7 +61,9 @@ for i in news_contents:
 
 pngb_news = pd.DataFrame(news_list, columns=["url", "news"])
 pngb_news = pngb_news.merge(urls_df, how="left", on="url")
-pngb_news = (pngb_news[["url", "date", "title", "news"]]
-                .sort_values(by="date")
+pngb_news = pngb_news[["url", "date", "title", "news"]]
+if previous_news_df is not None:
+    pngb_news = pd.concat([previous_news_df, pngb_news], axis=0)
+pngb_news = (pngb_news.sort_values(by="date")
                 .reset_index(drop=True))
-pngb_news.to_csv(target_dir + "png_business_news.csv", encoding="utf-8")
\ No newline at end of file
+save_csv(pngb_news, news_path)
\ No newline at end of file
@@ -5,11 +5,12 @@ from ..config import (PROJECT_FOLDER_PATH, POST_COURIER_PAGE_URLS,
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 from src.scraper.scrape import WebScraper
+from src.scraper.utils import save_csv, parse_dates, merge_sorted_frames
 
 target_folder = sys.path[0] + "data/text/papua_new_guinea/"
 
 ## Initialize the Scraper
-scraper = WebScraper('html.parser')
+scraper = WebScraper('lxml')
 pages_raw = scraper.scrape_urls(POST_COURIER_PAGE_URLS,
                                 POST_COURIER_PAGE_ELEMENTS,
                                 speed_up=True)
@@ -32,14 +33,14 @@ for page in pages_raw:
         urls_info.append([url, title, date])
 
 news_urls = pd.DataFrame(urls_info, columns=["url", "title", "date"])
-news_urls["date"] = pd.to_datetime(news_urls["date"], format="mixed")
+news_urls["date"] = parse_dates(news_urls["date"])
 news_urls = (news_urls.sort_values(by="date", ascending=False)
                 .drop_duplicates()
                 .reset_index(drop=True))
 news_urls.to_csv(target_folder + "post_courier_urls.csv", encoding="utf-8")
 
 if not SCRAPE_ALL: 
-    current_news = pd.read_csv(target_folder + "post_courier_news.csv").drop("Unnamed: 0", axis=1)
+    current_news = pd.read_csv(target_folder + "post_courier_news.csv", index_col=0)
     current_news["date"] = pd.to_datetime(current_news["date"])
     latest_date = current_news.date.max()
     urls_to_scrape = news_urls[news_urls.date > latest_date]["url"].tolist()
@@ -60,8 +61,7 @@ for i in news_raw:
 news_df = pd.DataFrame(scraped_news, columns=["url", "news", "tag"])
 news_df = news_df.merge(news_urls, how="left", on="url")
 if not SCRAPE_ALL:
-    news_df = pd.concat([news_df, current_news], axis=0)
-    news_df = news_df.sort_values(by="date", ascending=False).reset_index(drop=True)
-    news_df.to_csv(target_folder + "post_courier_news.csv", encoding="utf-8")
+    news_df = merge_sorted_frames([news_df, current_news])
+    save_csv(news_df, target_folder + "post_courier_news.csv")
 else:
     news_df.to_csv(target_folder + "post_courier_news.csv", encoding="utf-8")
\ No newline at end of file
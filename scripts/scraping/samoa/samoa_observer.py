@@ -3,8 +3,6 @@ import sys
 from ..config import PROJECT_FOLDER_PATH, SAMOA_OBSERVER_URLS, SCRAPE_ALL
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
-import json
-import requests
 from tqdm import tqdm
 import multiprocessing
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -14,49 +12,38 @@ target_dir = sys.path[0] + "data/text/samoa/"
 if not os.path.exists(target_dir):
     os.mkdir(target_dir)
 
-def load_page(url, timeout=30):
-    try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
-        output = json.loads(response.content)
-        return output
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to retrieve the page: {e}")
-        pass
+so = WebScraper("html.parser")
 
 
-scraped_data = []
+# Keep only the stories of each JSON page as it arrives, not the whole payload.
+stories = []
 with tqdm(total=len(SAMOA_OBSERVER_URLS)) as pbar:
     max_workers = multiprocessing.cpu_count() + 4
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(load_page, url): (url) for url in SAMOA_OBSERVER_URLS}
+        future_to_url = {executor.submit(so.request_json, url): (url) for url in SAMOA_OBSERVER_URLS}
         for future in as_completed(future_to_url):
-            url = future_to_url[future]
+            url = future_to_url.pop(future)
             try:
                 data = future.result()
             except Exception as exc:
                 print('%r generated an exception: %s' % (url, exc))
             else:
-                scraped_data.append([url, data])
+                if data is not None:
+                    stories.extend(data["stories"])
                 pbar.update(1)
 
-url_output = []
-for page in scraped_data:
-    request_url = page[0]
-    json_data = page[1]["stories"]
-    for i in json_data:
-        url_output.append([i["id"], i["heading"], i["published_date"], i["is_premium"]])
-
-so_urls = pd.DataFrame(url_output, columns=["id", "title", "date", "is_premium"])
+# Build the frame straight from the story dicts instead of copying each
+# story's fields into a list first.
+so_urls = (pd.DataFrame.from_records(
+                stories, columns=["id", "heading", "published_date", "is_premium"])
+             .rename(columns={"heading": "title", "published_date": "date"}))
 so_urls["date"] = pd.to_datetime(so_urls["date"])
 so_urls = so_urls.sort_values(by="date", ascending=True).reset_index(drop=True)
-so_urls["url"] = so_urls["id"].apply(lambda x: f"https://www.samoaobserver.ws/category/samoa/{x}")
+so_urls["url"] = "https://www.samoaobserver.ws/category/samoa/" + so_urls["id"].astype(str)
 so_urls.to_csv(target_dir+"samoa_observer_urls.csv", encoding="utf-8")
 
 ## Scrape News with non-subscription-needed urls
-so_urls = pd.read_csv(target_dir+"samoa_observer_urls.csv").drop("Unnamed: 0", axis=1)
 so_urls_to_scrape = so_urls[so_urls.is_premium == False]['url'].tolist()
-so = WebScraper("html.parser")
 so_raw = so.scrape_urls(so_urls_to_scrape, 
               "article__content text-new-brand-black py-0 leading-big",
               speed_up=True)
@@ -1,63 +1,82 @@
 import os
 import sys
-from ..config import PROJECT_FOLDER_PATH, SIBC_PAGE_URLS, SCRAPE_ALL
+from ..config import PROJECT_FOLDER_PATH, sibc_page_urls, SCRAPE_ALL, INCREMENTAL_PAGES
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 import numpy as np
+from lxml import etree
 from src.scraper.scrape import WebScraper
+from src.scraper.utils import (merge_previous_urls, filter_new_urls, save_csv,
+                               merge_sorted_frames)
 
 target_dir = sys.path[0] + "data/text/solomon_islands/"
+urls_path = target_dir + "sibc_urls.csv"
 
-scraper = WebScraper("html.parser")
-pages_raw = scraper.scrape_urls(SIBC_PAGE_URLS,
-                                "item-bot-content",
-                                speed_up=True)
-
-# Parse
-urls_info = []
-for page in pages_raw:
-    item = page[1][0]
-    title_entry = item.find(class_="item-title").find("a")
-    date_entry = item.find(class_="item-date-time")
-    date = date_entry.text.replace("-", "").strip()
-    urls_info.append([title_entry["href"], title_entry.text, date])
-
-urls_df = pd.DataFrame(urls_info, columns=["url", "title", "date"])
+# Listing fields, compiled once and evaluated on the lead item of every page.
+ITEM_XPATH = "(//*[contains(concat(' ', normalize-space(@class), ' '), ' item-bot-content ')])[1]"
+TITLE_LINK = "((.//*[contains(concat(' ', normalize-space(@class), ' '), ' item-title ')])[1]//a)[1]"
+URL_XPATH = etree.XPath(f"string({TITLE_LINK}/@href)", smart_strings=False)
+TITLE_XPATH = etree.XPath(f"string({TITLE_LINK})", smart_strings=False)
+DATE_XPATH = etree.XPath(
+    "string((.//*[contains(concat(' ', normalize-space(@class), ' '), ' item-date-time ')])[1])",
+    smart_strings=False)
+
+# Article fields: the body and taxonomy blocks, and their paragraphs and links.
+BODY_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' entry-body ')]"
+TAXONOMY_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' entry-taxonomies ')]"
+PARAGRAPH_XPATH = etree.XPath(".//p")
+LINK_XPATH = etree.XPath(".//a")
+TEXT_XPATH = etree.XPath("string()", smart_strings=False)
+
+scraper = WebScraper("xpath")
+page_urls = sibc_page_urls() if SCRAPE_ALL else sibc_page_urls(INCREMENTAL_PAGES)
+pages_raw = scraper.iter_scrape_urls(page_urls, ITEM_XPATH)
+
+# Parse each page as it arrives instead of holding every page in memory
+urls_info = ((URL_XPATH(item), TITLE_XPATH(item), DATE_XPATH(item))
+             for _, items in pages_raw for item in items)
+urls_df = pd.DataFrame.from_records(urls_info,
+                                    columns=["url", "title", "date"])
+urls_df["date"] = urls_df["date"].str.replace("-", "", regex=False).str.strip()
+urls_df = urls_df.drop_duplicates(subset="url")
+if not SCRAPE_ALL:
+    urls_df = merge_previous_urls(urls_df, urls_path)
 urls_df["date"] = pd.to_datetime(urls_df["date"], format="mixed")
 urls_df = urls_df.sort_values(by="date").reset_index(drop=True)
-urls_df.to_csv(target_dir + "sibc_urls.csv", encoding="utf-8")
+save_csv(urls_df, urls_path)
 
 
 previous_news_df = pd.read_csv(
-    target_dir + "sibc_news.csv").drop("Unnamed: 0", axis=1)
+    target_dir + "sibc_news.csv", index_col=0)
 previous_news_df["date"] = pd.to_datetime(
     previous_news_df["date"], format="mixed")
 
 if not SCRAPE_ALL:
-    previous_urls = set(previous_news_df["url"])
-    current_urls = set(urls_df["url"])
-    urls_to_scrape = list(current_urls - previous_urls)
+    urls_to_scrape = filter_new_urls(urls_df["url"], previous_news_df["url"])
 else:
     urls_to_scrape = urls_df["url"].tolist()
 
-news_raw = scraper.scrape_urls(urls_to_scrape,
-                               ["entry-body", "entry-taxonomies"],
-                               speed_up=True)
+# Nothing new since the last run: leave the news file untouched.
+if not urls_to_scrape:
+    print("No new articles to scrape.")
+    sys.exit(0)
+
+# Consume pages as they complete rather than holding every parsed page.
+news_raw = scraper.iter_scrape_urls(urls_to_scrape,
+                                    [BODY_XPATH, TAXONOMY_XPATH])
 
 news_info = []
 for news in news_raw:
     url = news[0]
     for news_entry, tag_entry in zip(*news[1]):
-        text = " ".join(p.text for p in news_entry.find_all("p"))
-        tags = ", ".join(tag.text for tag in tag_entry.find_all("a"))
+        text = " ".join(TEXT_XPATH(p) for p in PARAGRAPH_XPATH(news_entry))
+        tags = ", ".join(TEXT_XPATH(a) for a in LINK_XPATH(tag_entry))
         news_info.append([url, text, tags])
 
 news_df = pd.DataFrame(news_info, columns=["url", "news", "tag"])
-news_df = news_df.merge(urls_df, how="left", on="url")[["url", "title", "date", "news", "tag"]]
+news_df = news_df.merge(urls_df, how="left", on="url",
+                        validate="m:1")[["url", "title", "date", "news", "tag"]]
 if not SCRAPE_ALL:
-    current_news_df = pd.concat([news_df, previous_news_df], axis=0)
-    current_news_df = (current_news_df.sort_values(by="date", ascending=False)
-                        .reset_index(drop=True))
-    current_news_df.to_csv(target_dir + "sibc_news.csv", encoding="utf-8")
-else:
-    news_df.to_csv(target_dir + "sibc_news.csv", encoding="utf-8")
+    news_df = merge_sorted_frames([news_df, previous_news_df])
+# Full scrapes go through the same buffered, atomic writer as incremental ones.
+save_csv(news_df, target_dir + "sibc_news.csv")
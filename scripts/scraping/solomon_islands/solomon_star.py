@@ -5,11 +5,14 @@ sys.path.insert(0, PROJECT_FOLDER_PATH)
 import numpy as np
 import pandas as pd
 from src.scraper.scrape import WebScraper
-
-SCRAPE_ALL = True
+from src.scraper.utils import (filter_new_urls, save_csv, read_checkpoint,
+                               write_checkpoint)
 
 target_dir = sys.path[0] + "data/text/solomon_islands/"
-scraper = WebScraper('html.parser')
+checkpoint_path = target_dir + "solomon_star_news.checkpoint.csv"
+NEWS_COLUMNS = ["url", "news", "tag"]
+CHECKPOINT_EVERY = 50
+scraper = WebScraper('lxml')
 
 pages_raw = scraper.scrape_urls(SOLOMON_STAR_URLS,
                                 ["blog-content wf-td", "entry-title", "entry-date"],
@@ -24,6 +27,7 @@ for page in pages_raw:
         urls_info.append([url, date, title])
 
 urls_df = pd.DataFrame(urls_info, columns=["url", "date", "title"])
+urls_df = urls_df.drop_duplicates(subset="url")
 urls_df["date"] = pd.to_datetime(urls_df["date"], format="mixed")
 urls_df = (urls_df.sort_values(by="date", ascending=False)
            .reset_index(drop=True))
@@ -31,19 +35,39 @@ urls_df.to_csv(target_dir + "solomon_star_urls.csv", encoding="utf-8")
 
 
 previous_news_df = pd.read_csv(
-    target_dir + "solomon_star_news.csv").drop("Unnamed: 0", axis=1)
+    target_dir + "solomon_star_news.csv", index_col=0)
 previous_news_df["date"] = pd.to_datetime(
     previous_news_df["date"], format="mixed")
 if not SCRAPE_ALL:
-    previous_urls = set(previous_news_df["url"])
-    current_urls = set(urls_df["url"])
-    urls_to_scrape = list(current_urls - previous_urls)
+    urls_to_scrape = filter_new_urls(urls_df["url"], previous_news_df["url"])
 else:
     urls_to_scrape = urls_df["url"].tolist()
 
-news_raw = scraper.scrape_urls(urls_to_scrape,
-                               ["entry-content", "category-link"],
-                               speed_up=True)
+
+
+def drop_archived(df):
+    """
+    Drops checkpointed rows whose URL is already in the news archive, which
+    happens when a run crashed after saving but before removing its checkpoint.
+    """
+    if SCRAPE_ALL:
+        return df
+    new_urls = filter_new_urls(df["url"], previous_news_df["url"])
+    return df[df["url"].isin(new_urls)]
+
+
+# Resume an interrupted run: articles already in the checkpoint are skipped.
+checkpoint_df = drop_archived(read_checkpoint(checkpoint_path, NEWS_COLUMNS))
+urls_to_scrape = filter_new_urls(urls_to_scrape, checkpoint_df["url"])
+
+# Nothing new since the last run: leave the news file untouched.
+if not urls_to_scrape and checkpoint_df.empty:
+    print("No new articles to scrape.")
+    sys.exit(0)
+
+# Stream pages as they complete so extraction overlaps the remaining fetches.
+news_raw = scraper.iter_scrape_urls(urls_to_scrape,
+                                    ["entry-content", "category-link"])
 news_info = []
 for i in news_raw:
     url = i[0]
@@ -51,14 +75,21 @@ for i in news_raw:
         text = " ".join(p.text for p in text_entry.find_all("p"))
         tag = ", ".join(p.text for p in tag_entry.find_all("a"))
         news_info.append([url, text, tag])
+    if len(news_info) >= CHECKPOINT_EVERY:
+        write_checkpoint(news_info, checkpoint_path, NEWS_COLUMNS)
+        news_info = []
+write_checkpoint(news_info, checkpoint_path, NEWS_COLUMNS)
 
-news_df = pd.DataFrame(news_info, columns=["url", "news", "tag"])
-news_df = news_df.merge(urls_df[["url", "date"]], how="left", on="url")
+news_df = drop_archived(read_checkpoint(checkpoint_path, NEWS_COLUMNS))
+news_df = news_df.merge(urls_df[["url", "date"]], how="left", on="url",
+                        validate="m:1")
 
 if not SCRAPE_ALL:
     current_news_df = pd.concat([news_df, previous_news_df], axis=0)
-    current_news_df = (current_news_df.sort_index(by="date", ascending=False)
-                        .reset_index(drop=true))
-    current_news_df.to_csv(target_dir + "solomon_star_news.csv", encoding="utf-8")
+    current_news_df = (current_news_df.sort_values(by="date", ascending=False)
+                        .reset_index(drop=True))
+    save_csv(current_news_df, target_dir + "solomon_star_news.csv")
 else:
-    news_df.to_csv(target_dir + "solomon_star_news.csv", encoding="utf-8")
\ No newline at end of file
+    news_df.to_csv(target_dir + "solomon_star_news.csv", encoding="utf-8")
+if os.path.exists(checkpoint_path):
+    os.remove(checkpoint_path)
\ No newline at end of file
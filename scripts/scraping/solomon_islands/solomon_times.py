@@ -4,13 +4,28 @@ from ..config import PROJECT_FOLDER_PATH, SOLOMON_TIMES_URLS, SCRAPE_ALL
 sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 import numpy as np
+from lxml import etree
 from src.scraper.scrape import WebScraper
+from src.scraper.utils import filter_new_urls, save_csv, merge_sorted_frames
 
 target_dir = sys.path[0] + "data/text/solomon_islands/"
 
-scraper = WebScraper("html.parser")
+# Listing fields, compiled once and evaluated on every item of every page.
+ITEM_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' article-list-item ')]"
+URL_XPATH = etree.XPath("string((.//a)[1]/@href)", smart_strings=False)
+TITLE_XPATH = etree.XPath("string((.//h2)[1])", smart_strings=False)
+
+# Article fields.
+TIMESTAMP_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' article-timestamp ')]"
+BODY_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' article-body ')]"
+TAGS_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' tags ')]"
+DATETIME_XPATH = etree.XPath("string((.//span)[1]/@datetime)", smart_strings=False)
+LINK_XPATH = etree.XPath(".//a")
+TEXT_XPATH = etree.XPath("string()", smart_strings=False)
+
+scraper = WebScraper("xpath")
 pages_raw = scraper.scrape_urls(SOLOMON_TIMES_URLS, 
-                                ["article-list-item"], 
+                                [ITEM_XPATH], 
                                 speed_up=True)
 
 urls_info = []
@@ -18,46 +33,44 @@ for page in pages_raw:
     if len(page[1]) != 0:
         date = "-".join(i for i in page[0].split("/")[-2:])
         for i in page[1][0]:
-            url = (i.find("a")["href"])
-            title = (i.find("h2").text)
-            urls_info.append([url, title, date])
+            urls_info.append([URL_XPATH(i), TITLE_XPATH(i), date])
 
 urls_info_df = pd.DataFrame(urls_info, columns=["url", "title", "date"])
-urls_info_df["url"] = urls_info_df["url"].apply(lambda x: f"https://www.solomontimes.com{x}")
+urls_info_df = urls_info_df.drop_duplicates(subset="url")
+urls_info_df["url"] = "https://www.solomontimes.com" + urls_info_df["url"]
 urls_info_df["date"] = pd.to_datetime(urls_info_df["date"], format="mixed")
 urls_info_df.to_csv(target_dir + "solomon_times_urls.csv", encoding="utf-8")
 
 
-previous_news_df = pd.read_csv(target_dir + 'solomon_times_news.csv').drop("Unnamed: 0", axis=1)
+previous_news_df = pd.read_csv(target_dir + 'solomon_times_news.csv', index_col=0)
 previous_news_df["date"] = pd.to_datetime(previous_news_df["date"], format="mixed")
 if not SCRAPE_ALL:
-    previous_urls = set(previous_news_df["url"])
-    current_urls = set(urls_info_df["url"])
-    news_urls = list(current_urls - previous_urls)
+    news_urls = filter_new_urls(urls_info_df["url"], previous_news_df["url"])
 else:
     news_urls = urls_info_df["url"].tolist()
 
-news_raw = scraper.scrape_urls(news_urls,
-                               ["article-timestamp", "article-body", "tags"],
-                   speed_up=True)
+# Nothing new since the last run: leave the news file untouched.
+if not news_urls:
+    print("No new articles to scrape.")
+    sys.exit(0)
+
+# Consume pages as they complete rather than holding every parsed page.
+news_raw = scraper.iter_scrape_urls(news_urls,
+                                    [TIMESTAMP_XPATH, BODY_XPATH, TAGS_XPATH])
 news_info = []
 for i in news_raw:
     url = i[0]
     for (date, content, tag) in zip(*i[1]):
-        date = (date.find("span")["datetime"])
-        text = (content.text.strip())
-        tags = tag.find_all("a")
-        tags_text = " ".join(t.text + "," if i < len(tags) - 1 else t.text
-                    for i, t in enumerate(tags))
+        date = DATETIME_XPATH(date)
+        text = TEXT_XPATH(content).strip()
+        tags_text = ", ".join(TEXT_XPATH(t) for t in LINK_XPATH(tag))
         news_info.append([url, date, text, tags_text])
 
 news_df = pd.DataFrame(news_info, columns=["url", "date", "news", "tag"])
 news_df["date"] = pd.to_datetime(news_df["date"], format="mixed")
 if not SCRAPE_ALL:
-    current_news_df = pd.concat([news_df, previous_news_df], axis=0)
-    current_news_df = (current_news_df.sort_values(by="date", ascending=False)
-                       .reset_index(drop=True))
-    current_news_df.to_csv(target_dir + 'solomon_times_news.csv', encoding="utf-8")
+    current_news_df = merge_sorted_frames([news_df, previous_news_df])
+    save_csv(current_news_df, target_dir + 'solomon_times_news.csv')
 else:
     news_df.to_csv(target_dir + 'solomon_times_news.csv', encoding="utf-8")
 
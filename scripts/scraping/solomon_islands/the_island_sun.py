@@ -25,13 +25,13 @@ sys.path.insert(0, PROJECT_FOLDER_PATH)
 import pandas as pd
 import numpy as np
 from src.scraper.scrape import WebScraper
-from src.scraper.utils import configure_cookies, configure_headers
+from src.scraper.utils import configure_cookies, configure_headers, filter_new_urls, save_csv
 
 target_dir = sys.path[0] + "data/text/solomon_islands/"
 
 headers = configure_headers()
 scraper = WebScraper(
-    "html.parser",
+    "lxml",
     headers=headers,
     domain="https://theislandsun.com.sb/",
     cookies_path=COOKIES_PATH
@@ -50,24 +50,29 @@ for page in pages_raw:
             news_info.append([title_entry.text, url_entry["href"], date_entry.text, tag_entry.text])
 
 urls_df = pd.DataFrame(news_info, columns=["title", "url", "date", "tag"])
+urls_df = urls_df.drop_duplicates(subset="url")
 urls_df["date"] = pd.to_datetime(urls_df["date"], format="mixed")
 urls_df = urls_df.sort_values(by="date", ascending=False).reset_index(drop=True)
 urls_df.to_csv(target_dir + "island_sun_urls.csv", encoding="utf-8")
 
 
 previous_news_df = pd.read_csv(
-    target_dir + "island_sun_news.csv").drop("Unnamed: 0", axis=1)
+    target_dir + "island_sun_news.csv", index_col=0)
 previous_news_df["date"] = pd.to_datetime(
     previous_news_df["date"], format="mixed")
 if not SCRAPE_ALL:
-    previous_urls = set(previous_news_df["url"])
-    current_urls = set(urls_df["url"])
-    urls_to_scrape = list(current_urls - previous_urls)
+    urls_to_scrape = filter_new_urls(urls_df["url"], previous_news_df["url"])
 else:
     urls_to_scrape = urls_df["url"].tolist()
 
-news_raw = scraper.scrape_urls(
-    urls_to_scrape, "td-post-content tagdiv-type", speed_up=True)
+# Nothing new since the last run: leave the news file untouched.
+if not urls_to_scrape:
+    print("No new articles to scrape.")
+    sys.exit(0)
+
+# Stream pages as they complete so extraction overlaps the remaining fetches.
+news_raw = scraper.iter_scrape_urls(
+    urls_to_scrape, "td-post-content tagdiv-type")
 
 news_info = []
 for i in news_raw:
@@ -79,12 +84,12 @@ for i in news_raw:
     news_info.append([url, text])
 
 news_df = pd.DataFrame(news_info, columns=["url", "news"])
-news_df = news_df.merge(urls_df, how="left", on="url")
+news_df = news_df.merge(urls_df, how="left", on="url", validate="m:1")
 
 if not SCRAPE_ALL:
     current_news_df = pd.concat([news_df, previous_news_df], axis=0)
     current_news_df = (current_news_df.sort_values(by="date", ascending=False)
                             .reset_index(drop=True))
-    current_news_df.to_csv(target_dir + "island_sun_news.csv", encoding="utf-8")
+    save_csv(current_news_df, target_dir + "island_sun_news.csv")
 else:
     news_df.to_csv(target_dir + "island_sun_news.csv", encoding="utf-8")  
\ No newline at end of file
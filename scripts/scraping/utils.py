@@ -1,13 +1,23 @@
 import os
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import urllib
 import urllib.request
 from tqdm import tqdm
 
+# One pooled session for every page, so repeated requests to a news site
+# reuse kept-alive connections instead of a new TCP/TLS handshake each.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                       max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
 def load_page(url, timeout):
-    r = requests.get(url)
+    r = SESSION.get(url, timeout=timeout)
     return r.content
 
 def extract_news_info(url, params=None, timeout=5):
@@ -18,17 +28,20 @@ def extract_news_info(url, params=None, timeout=5):
         params = {"title_entry": "entry-container",
                   "title": "entry-title",
                   "date": "entry-date"}
+    # Resolve the lookups once per page rather than once per entry.
+    title_class, date_class = params["title"], params["date"]
+    urls, titles, dates = info_dict["url"], info_dict["title"], info_dict["date"]
     for a in soup.find_all(class_=params["title_entry"]):
-        entry_title = a.find(class_=params["title"])
-        if params["date"] is not None:
-            info_dict["date"].append(a.find(class_=params["date"]).text)
+        entry_title = a.find(class_=title_class)
+        if date_class is not None:
+            dates.append(a.find(class_=date_class).text)
         else:
-            info_dict["date"].append(np.NaN)
+            dates.append(np.NaN)
             
         if entry_title is not None:
-            info_dict["url"].append(entry_title.find("a").attrs["href"])
-            info_dict["title"].append(entry_title.text)
+            urls.append(entry_title.find("a").attrs["href"])
+            titles.append(entry_title.text)
         else:
-            info_dict["url"].append(a.find("a").attrs["href"])
-            info_dict["title"].append("Missing Title.")
+            urls.append(a.find("a").attrs["href"])
+            titles.append("Missing Title.")
     return info_dict
\ No newline at end of file
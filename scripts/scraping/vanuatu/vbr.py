@@ -2,48 +2,56 @@ import sys
 import os
 sys.path.insert(0, "/Users/czhang/Desktop/pacific-observatory/")
 import pandas as pd
+from lxml import etree
 from src.scraper.scrape import SeleniumScraper, WebScraper
 
 target_dir = sys.path[0] + "data/text/vanuatu/"
 output_path = target_dir + "vbr_news.csv"
 
+# Listing fields, compiled once and evaluated on every post of every page.
+POST_XPATH = "//*[normalize-space(@class)='post has-thumbnail']"
+URL_XPATH = etree.XPath("string((.//a)[1]/@href)", smart_strings=False)
+DATE_XPATH = etree.XPath(
+    "string((.//*[contains(concat(' ', normalize-space(@class), ' '), ' post-info ')])[1])",
+    smart_strings=False)
+TITLE_XPATH = etree.XPath("string((.//h2)[1])", smart_strings=False)
+
+# Article body: the text of every paragraph after the first, in one call.
+ARTICLE_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' post ')]"
+PARAGRAPH_TEXT_XPATH = etree.XPath("(.//p)[position() > 1]//text()",
+                                   smart_strings=False)
+
 
 page_urls = [f"https://vbr.vu/category/news/page/{num}" for num in range(1,61)]
-vbr = WebScraper("html.parser")
-urls_raw = vbr.scrape_urls(page_urls, "post has-thumbnail", speed_up=True)
-
-urls_info = {
-    "url": [], 
-    "date": [], 
-    "title": [], 
-}
-for page in urls_raw:
-    url = page[0]
-    info = page[1]
-    titles = [i.find("h2").text.strip() for i in info]
-    urls = [i.find("a")["href"] for i in info]
-    dates = [i.find(class_="post-info").text.split("|")[0].strip()
-             for i in info]
-    urls_info["url"].extend(urls)
-    urls_info["title"].extend(titles)
-    urls_info["date"].extend(dates)
-
-vbr_urls = pd.DataFrame(urls_info)
-vbr_urls["date"] = pd.to_datetime(vbr_urls["date"])
+# Pages are parsed as they arrive rather than after the whole batch; the
+# token bucket keeps vbr.vu to two requests per second across the workers.
+vbr = WebScraper("xpath", max_workers=4, rate_limit=2)
+urls_raw = vbr.iter_scrape_urls(page_urls, POST_XPATH)
+
+# One record per post, collected across pages and framed once at the end.
+urls_info = ((URL_XPATH(i), DATE_XPATH(i), TITLE_XPATH(i))
+             for _, info in urls_raw for i in info)
+vbr_urls = pd.DataFrame.from_records(urls_info,
+                                     columns=["url", "date", "title"])
+# Pinned posts repeat across listing pages; keep one row per article.
+vbr_urls = vbr_urls.drop_duplicates(subset="url")
+vbr_urls["date"] = pd.to_datetime(
+    vbr_urls["date"].str.split("|", n=1).str[0].str.strip())
+vbr_urls["title"] = vbr_urls["title"].str.strip()
 vbr_urls.to_csv(target_dir + "vbr_urls.csv", encoding="utf-8")
 
 news_urls = vbr_urls["url"].tolist()
-news_info = vbr.scrape_urls(news_urls, "post", speed_up=True)
+news_info = vbr.iter_scrape_urls(news_urls, ARTICLE_XPATH)
 
 vbr_news = []
 for info in news_info:
     url = info[0]
-    news_raw = info[1][0]
-    news = "".join(p.text for p in news_raw.find_all("p")[1:])
+    news = "".join(PARAGRAPH_TEXT_XPATH(info[1][0]))
     vbr_news.append([url, news])
 
 vbr_news_df = pd.DataFrame(vbr_news, columns=["url", "news"])
-vbr_news_df = vbr_news_df.merge(vbr_urls, how="left", on="url")
+vbr_news_df = vbr_news_df.merge(vbr_urls, how="left", on="url",
+                                validate="m:1")
 vbr_news_df = vbr_news_df[["url", "date", "title", "news"]]
 vbr_news_df.to_csv(f"{target_dir}/vbr_news.csv", encoding="utf-8")
 
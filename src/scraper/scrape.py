@@ -1,8 +1,17 @@
 import time
+import csv
+import json
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 import multiprocessing
+import threading
+from typing import NamedTuple
+from urllib.parse import urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from lxml import etree
 from tqdm import tqdm
 from selenium.webdriver.common.by import By
@@ -12,20 +21,89 @@ from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from .utils import configure_cookies
 
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
+}
+
+# Status codes worth retrying; other 4xx responses are permanent failures.
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+# Cloudflare answers with these when the clearance cookies have expired.
+COOKIE_STATUS_CODES = {401, 403}
+# Retry delays grow as BACKOFF_BASE * 2 ** attempt seconds, up to BACKOFF_CAP.
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+# Serializes appends to failed-URL logs shared by `scrape_pages` workers.
+FAILED_LOG_LOCK = threading.Lock()
+
+
+class FailedURL(NamedTuple):
+    """
+    A URL that could not be scraped, kept as a tuple to stay compact.
+    """
+    url: str
+    error: str
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket allowing `rate` requests per second on average,
+    with bursts of up to `capacity` requests.
+
+    Unlike a fixed sleep per request, idle time is banked as tokens, so
+    concurrent workers share the allowed throughput instead of each being
+    slowed down on its own.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until it is available.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now so waiting callers queue up fairly.
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
 
 class WebScraper(object):
     def __init__(self, parser="xpath",
                  domain=None,
                  headers=None, 
                  cookies=None,
-                 cookies_path=None):
+                 cookies_path=None,
+                 rate_limit=None,
+                 max_workers=None):
         """
         A class for web scraping using either HTML or XPath parsing.
 
         Args:
             parser (str, optional): The parser to use for parsing the web page. 
-                Either "HTML" (default) or "XPATH". 
+                Either "HTML" (default) or "XPATH". "lxml" behaves like "HTML"
+                but builds the BeautifulSoup tree with the C-backed lxml parser,
+                which is much faster and does not hold the GIL while parsing,
+                so `speed_up` workers parse pages in parallel.
             headers (dict, optional): Custom headers to use for HTTP requests.
+            rate_limit (float, optional): The maximum number of requests per
+                second to each host, across all worker threads. Unlimited by
+                default.
+            max_workers (int, optional): The number of concurrent requests made
+                by `speed_up` and `iter_scrape_urls`. Fetching is I/O-bound,
+                so it can exceed the CPU count for hosts that tolerate it.
+                Defaults to a CPU-based count.
 
         Raises:
             ValueError: If an invalid parser is provided.
@@ -34,24 +112,43 @@ class WebScraper(object):
             parser (str): The selected parser ("HTML" or "XPATH").
             headers (dict): HTTP headers to use for requests.
         """
-        if parser not in ["html.parser", "xpath"]:
-            raise ValueError("Invalid parser. Use 'html.parser' or 'xpath'.")
+        if parser not in ["html.parser", "lxml", "xpath"]:
+            raise ValueError(
+                "Invalid parser. Use 'html.parser', 'lxml' or 'xpath'.")
 
         self.parser = parser
         if headers is None:
-            self.headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
-            }
+            self.headers = DEFAULT_HEADERS.copy()
         else:
             self.headers = headers
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
         self.domain = domain
         self.cookies_path = cookies_path
         self.cookies = {}
         if domain:
             self.refresh_cookies()
         self.item_container = None
+        # One token bucket per host, created on first use.
+        self.rate_limit = rate_limit
+        self.rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
+        # Compiled XPath expressions, kept per thread since lxml evaluators
+        # must not be shared between threads.
+        self._xpath_cache = threading.local()
+        # Strainers keyed by the tuple of classes they keep.
+        self._strainers = {}
+        # Cookie-protected domains are scraped more gently.
+        if max_workers is None:
+            max_workers = (multiprocessing.cpu_count()
+                           if domain else multiprocessing.cpu_count() + 4)
+        self.max_workers = max_workers
+        # Keep one pooled connection per worker thread; the default pool of 10
+        # discards connections under `speed_up` and forces new TLS handshakes.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.max_workers,
+                              pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
 
     def refresh_cookies(self):
@@ -72,34 +169,113 @@ class WebScraper(object):
         Returns:
             bytes: The content of the HTTP response.
         """ 
-        try:
-            response = self.session.get(
-                url, headers=self.headers, timeout=timeout, cookies=self.cookies)
-            response.raise_for_status()
-            return response.content
-        except requests.exceptions.RequestException as e:
-            time.sleep(5)
-            if retries > 0:
+        for attempt in range(retries + 1):
+            if self.rate_limit:
+                self.get_rate_limiter(url).acquire()
+            try:
+                response = self.session.get(
+                    url, timeout=timeout, cookies=self.cookies)
+                response.raise_for_status()
+                return response.content
+            except requests.exceptions.RequestException as e:
+                if not self._is_retryable(e):
+                    print(f"Failed to retrieve the page, not retrying: {e}")
+                    return None
+                if attempt == retries:
+                    print(f"Failed to retrieve the page after retries: {e}")
+                    return None
                 print(f"Failed to retrieve the page, attempting to refresh cookies and retry: {e}")
-                self.refresh_cookies()  # Refresh cookies if request fails
-                return self.request_url(url, timeout, retries - 1)  # Decrement retries and retry the request
-            else:
-                print(f"Failed to retrieve the page after retries: {e}")
-                return None
+                time.sleep(self._retry_delay(e, attempt))
+                if self.domain:
+                    self.refresh_cookies()  # Refresh cookies if request fails
 
-    def parse_content(self, content):
+    def get_rate_limiter(self, url):
+        """
+        Returns the token bucket of the URL's host, so hosts are throttled
+        independently of each other.
+        """
+        host = urlsplit(url).netloc
+        with self._rate_limiters_lock:
+            limiter = self.rate_limiters.get(host)
+            if limiter is None:
+                limiter = self.rate_limiters[host] = TokenBucket(self.rate_limit)
+        return limiter
+
+    def request_json(self, url, timeout=30, retries=3):
+        """
+        Sends an HTTP GET request to a JSON endpoint.
+
+        The request goes through `request_url`, so it shares the session, cookies
+        and retry policy of the scraper.
+
+        Args:
+            url (str): The URL to send the request to.
+            timeout (int): The timeout value for the request in seconds.
+            retries (int): The number of retries for transient failures.
+
+        Returns:
+            dict or list: The decoded JSON payload, or None if the request failed.
+        """
+        content = self.request_url(url, timeout, retries)
+        if content is None:
+            return None
+        return json.loads(content)
+
+    @staticmethod
+    def _retry_delay(error, attempt):
+        """
+        Returns how long to wait before retrying a failed request.
+
+        A `Retry-After` header on the response (seconds or an HTTP date) is
+        honoured as is; otherwise the delay backs off exponentially with jitter.
+        """
+        response = getattr(error, "response", None)
+        retry_after = None if response is None else response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+        return delay + random.uniform(0, BACKOFF_BASE)
+
+    def _is_retryable(self, error):
+        """
+        Checks whether a failed request is worth retrying.
+
+        Connection errors and timeouts carry no response and are always retried.
+        Responses are retried only for transient status codes, or for 401/403
+        when cookies can be refreshed for the configured domain.
+        """
+        response = getattr(error, "response", None)
+        if response is None:
+            return True
+        status_code = response.status_code
+        if status_code in TRANSIENT_STATUS_CODES or status_code >= 500:
+            return True
+        return bool(self.domain) and status_code in COOKIE_STATUS_CODES
+
+    def parse_content(self, content, parse_only=None):
         """
          Parses the HTTP response content using the specified parser.
 
         Args:
             content (bytes): The content to be parsed.
+            parse_only (SoupStrainer, optional): Restricts a BeautifulSoup tree to
+                the matching elements; ignored by the xpath parser.
 
         Returns:
             object: The parsed content object (either lxml.etree or BeautifulSoup).
         """
 
-        return etree.HTML(str(content)) if self.parser == "xpath" else BeautifulSoup(
-            content, "html.parser")
+        # lxml takes the raw bytes; str(content) would build an escaped repr.
+        return etree.HTML(content) if self.parser == "xpath" else BeautifulSoup(
+            content, self.parser, parse_only=parse_only)
 
     def extract_items(self, parsed_content,
                       expression: str):
@@ -116,22 +292,111 @@ class WebScraper(object):
         """
 
         if self.parser == "xpath":
-            self.item_container = parsed_content.xpath(expression)
+            self.item_container = self.compile_xpath(expression)(parsed_content)
         else:
             self.item_container = parsed_content.find_all(
                 class_=expression)
         return self.item_container
 
-    def scrape_url(self, url, expression):
+    def compile_xpath(self, expression):
+        """
+        Returns the compiled form of an XPath expression, compiling it once.
+
+        Args:
+            expression (str): The XPath expression.
+
+        Returns:
+            lxml.etree.XPath: A callable evaluating the expression on a tree.
+        """
+        compiled = getattr(self._xpath_cache, "compiled", None)
+        if compiled is None:
+            compiled = self._xpath_cache.compiled = {}
+        if expression not in compiled:
+            compiled[expression] = etree.XPath(expression)
+        return compiled[expression]
+
+    @staticmethod
+    def check_expression(expression):
+        """
+        Validates the expression(s) passed to `scrape_url` / `scrape_urls`.
+
+        Args:
+            expression (str or list): A single expression or a list of expressions.
+
+        Raises:
+            TypeError: If the expression is neither a string nor a list of strings.
+        """
+        if isinstance(expression, str):
+            return
+        if isinstance(expression, list) and all(
+                isinstance(expr, str) for expr in expression):
+            return
+        raise TypeError(
+            "The 'expression' argument must be a string or a list of strings.")
+
+    def make_strainer(self, expression):
+        """
+        Builds a SoupStrainer keeping only the elements `extract_items` looks for.
+
+        Soup parsers extract by class, so the tree only needs the subtrees whose
+        class matches one of the expressions; everything else on the page is
+        skipped while parsing. Strainers are built once per scraper and reused
+        for later calls with the same expression(s).
+
+        While parsing, the strainer sees the raw `class` attribute string, so
+        the match is made on its tokens: like `find_all(class_=...)`, an element
+        is kept when one of its classes, or its whole class string, equals an
+        expression.
+
+        Args:
+            expression (str or list): The expression(s) used for extraction.
+
+        Returns:
+            SoupStrainer: The strainer, or None for the xpath parser.
+        """
+        if self.parser == "xpath":
+            return None
+        classes = (expression,) if isinstance(expression, str) else tuple(expression)
+        strainer = self._strainers.get(classes)
+        if strainer is None:
+            wanted = set(classes)
+
+            def match_class(value):
+                if value is None:
+                    return False
+                if not isinstance(value, str):
+                    value = " ".join(value)
+                return value in wanted or not wanted.isdisjoint(value.split())
+
+            strainer = self._strainers[classes] = SoupStrainer(class_=match_class)
+        return strainer
+
+    def scrape_url(self, url, expression, validate=True, parse_only=None):
         """
         Scrape single url's content by a given expression.
+
+        Args:
+            url (str): The URL to scrape.
+            expression (str or list): The expression(s) used for extraction.
+            validate (bool): Whether to validate `expression` first. Callers that
+                have already validated it once for a batch (e.g. `scrape_urls`)
+                can skip the per-URL check.
+            parse_only (SoupStrainer, optional): A strainer from `make_strainer`;
+                looked up here when not given.
         """
+        if validate:
+            self.check_expression(expression)
+        if parse_only is None:
+            parse_only = self.make_strainer(expression)
         try:
             content = self.request_url(url)
-            parsed_content = self.parse_content(content)
+            # request_url has already reported the failure; nothing to parse.
+            if content is None:
+                return []
+            parsed_content = self.parse_content(content, parse_only)
             if isinstance(expression, str):
                 items = self.extract_items(parsed_content, expression)
-            elif isinstance(expression, list):
+            else:
                 items = [self.extract_items(parsed_content, expr)
                          for expr in expression]
         except Exception as e:
@@ -142,6 +407,7 @@ class WebScraper(object):
     def scrape_urls(self, urls, expression, speed_up=False):
         if not isinstance(urls, list):
             raise TypeError("The 'urls' argument must be a list of URLs.")
+        self.check_expression(expression)
 
         # if isinstance(expression, str):
         #     expression = [expression] * len(urls)
@@ -156,29 +422,51 @@ class WebScraper(object):
 
         scraped_data = []
         if speed_up:
-            with tqdm(total=len(urls)) as pbar:
-                max_workers = multiprocessing.cpu_count() + 4 if not self.domain else multiprocessing.cpu_count() 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_url = {executor.submit(self.scrape_url, url, expression): (
-                        url) for url in urls}
-                    for future in as_completed(future_to_url):
-                        url = future_to_url[future]
-                        try:
-                            data = future.result()
-                        except Exception as exc:
-                            print(f'{url} generated an exception: {exc}')
-                        else:
-                            scraped_data.append([url, data])
-                            pbar.update(1)
+            scraped_data = list(self.iter_scrape_urls(urls, expression))
         else:
+            strainer = self.make_strainer(expression)
             with tqdm(total=len(urls)) as pbar:
                 for url in urls:
-                    data = self.scrape_url(url, expression)
+                    data = self.scrape_url(url, expression, False, strainer)
                     scraped_data.append(data)
                     pbar.update(1)
 
         return scraped_data
 
+    def iter_scrape_urls(self, urls, expression):
+        """
+        Scrapes URLs concurrently and yields [url, data] pairs as they complete.
+
+        Unlike `scrape_urls`, parsed pages are not accumulated, so callers can
+        extract what they need from each page and let it be freed.
+
+        Args:
+            urls (list): The URLs to scrape.
+            expression (str or list): The expression(s) used for extraction.
+
+        Yields:
+            list: A [url, data] pair for every distinct URL scraped without an
+                exception.
+        """
+        self.check_expression(expression)
+        strainer = self.make_strainer(expression)
+        # Listing pages often repeat the same article; fetch each URL once.
+        urls = list(dict.fromkeys(urls))
+        with tqdm(total=len(urls)) as pbar:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_url = {executor.submit(self.scrape_url, url, expression, False, strainer): (
+                    url) for url in urls}
+                for future in as_completed(future_to_url):
+                    # Drop the future so its result is released once consumed
+                    url = future_to_url.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as exc:
+                        print(f'{url} generated an exception: {exc}')
+                    else:
+                        pbar.update(1)
+                        yield [url, data]
+
 
 class SeleniumScraper:
     """
@@ -201,19 +489,45 @@ class SeleniumScraper:
         scraper.close_driver()
     """
 
-    def __init__(self, driver_path, download_path):
+    def __init__(self, driver_path, download_path=None,
+                 failed_log_path=None, max_failed=1024):
         """
         Initialize the WebScraper object.
 
         Args:
             driver_path (str): The path to the ChromeDriver executable.
-            url (str): The URL to be scraped.
+            download_path (str, optional): The default download directory.
+            failed_log_path (str, optional): A CSV file that failed URLs are
+                flushed to, so that `failed_urls` does not grow for the whole run.
+            max_failed (int): The number of failed URLs buffered before flushing.
         """
         self.driver_path = driver_path
         self.download_path = download_path
+        self.failed_log_path = failed_log_path
+        self.max_failed = max_failed
         self.failed_urls = []
         self.driver = None
 
+    def add_failed_url(self, url, error):
+        """
+        Records a failed URL, flushing the buffer to `failed_log_path` once it
+        holds `max_failed` entries.
+        """
+        self.failed_urls.append(FailedURL(url, error))
+        if self.failed_log_path and len(self.failed_urls) >= self.max_failed:
+            self.flush_failed_urls()
+
+    def flush_failed_urls(self):
+        """
+        Appends the buffered failed URLs to `failed_log_path` and clears the buffer.
+        """
+        if not self.failed_log_path or not self.failed_urls:
+            return
+        with FAILED_LOG_LOCK, open(self.failed_log_path, "a", encoding="utf-8",
+                                   newline="") as file:
+            csv.writer(file).writerows(self.failed_urls)
+        self.failed_urls.clear()
+
     def start_driver(self):
         """
         Start the ChromeDriver.
@@ -235,6 +549,7 @@ class SeleniumScraper:
         """
         if self.driver:
             self.driver.quit()
+        self.flush_failed_urls()
 
     def perform_search(self, search_query):
         """
@@ -263,5 +578,57 @@ class SeleniumScraper:
             elements = self.perform_search(search_query)
             return elements
         except Exception as e:
-            self.failed_urls.append((url, str(e)))
+            self.add_failed_url(url, str(e))
             return None
+
+    def scrape_pages(self, urls, search_query, max_workers=4):
+        """
+        Scrapes several URLs concurrently, each worker thread driving its own
+        ChromeDriver so a slow page does not hold up the others.
+
+        WebElements go stale once their driver navigates away, so the text of
+        the matched elements is extracted inside the worker. Pages are
+        collected as they complete, so each result carries its URL rather than
+        relying on its position in `urls`.
+
+        Args:
+            urls (list): The URLs of the web pages to be scraped.
+            search_query (str): The XPath used to find elements on each page.
+            max_workers (int): The number of browsers driven in parallel.
+
+        Returns:
+            list: A list of [url, texts] pairs in completion order, where texts
+                is a list of element texts, or None if the elements could not
+                be found.
+        """
+        local = threading.local()
+        workers = []
+        lock = threading.Lock()
+
+        def scrape(url):
+            if not hasattr(local, "scraper"):
+                # Workers log to the same file, flushing their own buffers.
+                local.scraper = SeleniumScraper(self.driver_path,
+                                                self.download_path,
+                                                self.failed_log_path,
+                                                self.max_failed)
+                local.scraper.start_driver()
+                with lock:
+                    workers.append(local.scraper)
+            elements = local.scraper.scrape_page(url, search_query)
+            if elements is None:
+                return [url, None]
+            return [url, [elem.text for elem in elements]]
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(scrape, url) for url in urls]
+                scraped_data = [future.result() for future in
+                                tqdm(as_completed(futures), total=len(urls))]
+        finally:
+            for worker in workers:
+                worker.close_driver()
+                self.failed_urls.extend(worker.failed_urls)
+            if self.failed_log_path and len(self.failed_urls) >= self.max_failed:
+                self.flush_failed_urls()
+        return scraped_data
@@ -1,4 +1,5 @@
 import os
+import shutil
 import urllib3
 import pandas as pd
 import numpy as np
@@ -8,8 +9,13 @@ from pycookiecheat import chrome_cookies
 from dateutil.parser import parse
 from datetime import datetime, timedelta
 
+# One pool shared by every download, so repeated requests to the same host
+# reuse kept-alive connections instead of opening a new one per file.
+HTTP_POOL = urllib3.PoolManager(maxsize=8)
+
+
 # Wrap the urllib3 downloading functions
-def download_files(url: str, path: str, chunk_size=1024):
+def download_files(url: str, path: str, chunk_size=1 << 16):
     """
     Args
     ------
@@ -18,25 +24,20 @@ def download_files(url: str, path: str, chunk_size=1024):
     path: string
         The string of the saving path.
     chuck_sise: int
-        The default is set as 1024.
+        The size of each read/write chunk. The default is set as 64KB.
 
     Return
     ------
         N/A
     """
 
-    http = urllib3.PoolManager()
-    r = http.request(
+    r = HTTP_POOL.request(
         'GET',
         url,
         preload_content=False)
 
     with open(path, 'wb') as out:
-        while True:
-            data = r.read(chunk_size)
-            if not data:
-                break
-            out.write(data)
+        shutil.copyfileobj(r, out, chunk_size)
     r.release_conn()
 
 def configure_headers():
@@ -65,24 +66,281 @@ def configure_cookies(host_url: str, cookies_path: str) -> dict:
     return cookies
 
 def check_latest_date(filepath: str):
-    df = pd.read_csv(filepath)
+    # Only the date column is needed; skip parsing the article bodies.
+    df = pd.read_csv(filepath, usecols=lambda column: column == "date")
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"], format="mixed")
         return df["date"].max()
     
 
-def handle_mixed_dates(date: str, pattern="\d+"):
+def normalize_urls(urls) -> pd.Series:
+    """
+    Maps URLs to the keys used to compare them, lower-cased and without a
+    trailing slash, with vectorized pandas string methods.
+    """
+    return (pd.Series(urls, dtype="object").astype(str)
+              .str.rstrip("/").str.lower())
+
+
+def url_fingerprints(urls) -> pd.Series:
+    """
+    Hashes the normalized URLs to 64-bit fingerprints, so large URL sets are
+    compared as integers rather than as long strings.
+    """
+    keys = normalize_urls(urls)
+    return pd.Series(pd.util.hash_array(keys.to_numpy()), index=keys.index)
+
+
+def filter_new_urls(urls, existing_urls) -> list:
+    """
+    Keeps the URLs that have not been scraped yet, in their original order.
+
+    URLs are compared on their normalized form, so trailing-slash or casing
+    variants are not mistaken for new ones. Membership is tested on 64-bit
+    fingerprints with a vectorized hash lookup (`Series.isin`) rather than a
+    Python loop over the URL strings.
+
+    Args:
+        urls (iterable): The URLs discovered in the current run.
+        existing_urls (iterable): The URLs that have already been scraped.
+
+    Returns:
+        list: The new URLs, without duplicates.
+    """
+    urls = pd.Series(urls, dtype="object").reset_index(drop=True)
+    keys = url_fingerprints(urls)
+    is_new = ~keys.isin(url_fingerprints(existing_urls)) & ~keys.duplicated()
+    return urls[is_new].tolist()
+
+
+def flatten_records(records, fields: dict) -> pd.DataFrame:
+    """
+    Flattens nested JSON records into the columns named by `fields`.
+
+    Fields missing from a record become NaN. The columns are kept as object
+    dtype, so an empty collection, or a field that no record carries, still
+    supports string concatenation and the `.str` methods.
+
+    Args:
+        records (list): The JSON records, e.g. one page of an API response.
+        fields (dict): Maps dotted record paths to output column names.
+
+    Returns:
+        pd.DataFrame: One row per record, with the columns of `fields`.
+    """
+    return (pd.json_normalize(records)
+              .reindex(columns=list(fields))
+              .rename(columns=fields)
+              .astype(object))
+
+
+def merge_previous_urls(urls_df: pd.DataFrame, filepath: str,
+                        key: str = "url") -> pd.DataFrame:
+    """
+    Combines freshly discovered listing entries with the ones saved by the
+    previous run, so incremental runs only need to re-scrape the first few
+    listing pages.
+
+    Args:
+        urls_df (pd.DataFrame): The entries discovered in the current run.
+        filepath (str): The path of the URL file saved by the previous run.
+        key (str): The column identifying an entry. Defaults to "url".
+
+    Returns:
+        pd.DataFrame: The current entries followed by the previously saved ones
+            that were not rediscovered, each `key` appearing once among the
+            saved entries.
+    """
+    if not os.path.exists(filepath):
+        return urls_df
+    # URL files saved by older runs may repeat entries.
+    previous_df = (pd.read_csv(filepath, index_col=0)
+                     .drop_duplicates(subset=key))
+    previous_df = previous_df[~previous_df[key].isin(urls_df[key])]
+    return pd.concat([urls_df, previous_df[urls_df.columns]],
+                     axis=0, ignore_index=True)
+
+
+def merge_sorted_frames(frames, by: str = "date",
+                        ascending: bool = False) -> pd.DataFrame:
+    """
+    Combines news frames into one frame sorted on `by`.
+
+    The archives are saved sorted, so after concatenation the rows form a
+    few long sorted runs. A stable sort (timsort) merges such runs in about
+    linear time, where the default quicksort re-sorts the whole archive.
+
+    Args:
+        frames (list): The frames to combine, e.g. the new rows and an archive.
+        by (str): The column to sort on. Defaults to "date".
+        ascending (bool): The sort order. Defaults to newest first.
+
+    Returns:
+        pd.DataFrame: The combined rows with a fresh index.
+    """
+    return (pd.concat(frames, axis=0, ignore_index=True)
+              .sort_values(by=by, ascending=ascending, kind="stable",
+                           ignore_index=True))
+
+
+def save_csv(df: pd.DataFrame, filepath: str) -> None:
+    """
+    Writes a DataFrame to CSV atomically.
+
+    The rows go through a 1MB buffered writer into a temporary file next to
+    `filepath`, which then replaces it, so an interrupted run never leaves a
+    truncated news archive behind.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        filepath (str): The destination path.
+    """
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="",
+              buffering=1 << 20) as file:
+        df.to_csv(file)
+    os.replace(tmp_path, filepath)
+
+
+def append_news(news_df: pd.DataFrame, filepath: str) -> None:
+    """
+    Appends newly scraped rows to a news CSV instead of reloading and
+    rewriting the whole archive.
+
+    The rows are aligned to the columns of the existing file, and the header
+    is only written when the file does not exist yet. The index column is kept
+    so the layout matches files written with `to_csv`; appended rows are
+    numbered on from the rows already in the file, so the index stays unique.
+
+    Args:
+        news_df (pd.DataFrame): The newly scraped rows.
+        filepath (str): The path of the news CSV.
+    """
+    if os.path.exists(filepath):
+        columns = pd.read_csv(filepath, index_col=0, nrows=0).columns
+        # Only the index column is parsed to count the existing rows.
+        start = len(pd.read_csv(filepath, usecols=[0]))
+        index = pd.RangeIndex(start, start + len(news_df))
+        news_df[columns].set_axis(index).to_csv(filepath, mode="a",
+                                                header=False, encoding="utf-8")
+    else:
+        news_df.to_csv(filepath, encoding="utf-8")
+
+
+def read_checkpoint(filepath: str, columns: list) -> pd.DataFrame:
+    """
+    Reads the rows an interrupted run already scraped.
+
+    Args:
+        filepath (str): The path of the checkpoint CSV.
+        columns (list): The columns of the checkpointed rows.
+
+    Returns:
+        pd.DataFrame: The checkpointed rows, or an empty frame with `columns`
+            when there is no checkpoint.
+    """
+    if not os.path.exists(filepath):
+        return pd.DataFrame(columns=columns)
+    return pd.read_csv(filepath, usecols=columns)[columns]
+
+
+def write_checkpoint(rows: list, filepath: str, columns: list) -> None:
+    """
+    Appends scraped rows to a checkpoint CSV so a crashed article pass can
+    resume without fetching them again.
+
+    Args:
+        rows (list): The rows scraped since the last checkpoint.
+        filepath (str): The path of the checkpoint CSV.
+        columns (list): The columns of the rows.
+    """
+    if not rows:
+        return
+    pd.DataFrame(rows, columns=columns).to_csv(
+        filepath, mode="a", header=not os.path.exists(filepath),
+        index=False, encoding="utf-8")
+
+
+# Date layouts used by the news sites, tried in order against a sample date.
+# Only unambiguous layouts are listed: numeric slash dates are left to the
+# `format="mixed"` fallback, so a column never mixes day-first and
+# month-first readings.
+DATE_FORMATS = ["%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y",
+                "%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]
+
+
+def parse_dates(dates, formats=DATE_FORMATS) -> pd.Series:
+    """
+    Parses a column of dates that mostly share one layout.
+
+    The layout is detected once from the first date and used for a vectorized,
+    cached parse of the whole column; only the dates it does not fit (e.g.
+    rows merged from an earlier run's file) fall back to `format="mixed"`,
+    which parses row by row.
+
+    Args:
+        dates (iterable): The date strings.
+        formats (list): The candidate strptime layouts.
+
+    Returns:
+        pd.Series: The parsed dates.
+    """
+    dates = pd.Series(dates)
+    sample = dates.dropna()
+    if dates.dtype != object or sample.empty or not isinstance(sample.iloc[0], str):
+        return pd.to_datetime(dates, format="mixed")
+    sample = sample.iloc[0]
+    for date_format in formats:
+        try:
+            datetime.strptime(sample, date_format)
+        except ValueError:
+            continue
+        parsed = pd.to_datetime(dates, format=date_format, errors="coerce",
+                                cache=True)
+        rest = parsed.isna() & dates.notna()
+        if rest.any():
+            parsed[rest] = pd.to_datetime(dates[rest], format="mixed")
+        return parsed
+    return pd.to_datetime(dates, format="mixed")
+
+
+def handle_mixed_dates(date: str, pattern=r"\d+"):
     try:
-        date = parse(date)
-    except:
-        if "ago" in date:
-            now = datetime.now()
-            number = int(re.findall(pattern, date)[0])
-            if "min" in date:
-                date = now - timedelta(minutes=number)
-            elif "hr" in date or "hour" in date:
-                date = now - timedelta(hours=number)
-    finally:
+        return parse(date)
+    except (ValueError, OverflowError, TypeError):
+        pass
+    # Relative dates such as "5 mins ago" or "2 hrs ago"
+    if not isinstance(date, str) or "ago" not in date:
+        return date
+    match = re.search(pattern, date)
+    if match is None:
         return date
+    number = int(match.group())
+    if "min" in date:
+        return datetime.now() - timedelta(minutes=number)
+    if "hr" in date or "hour" in date:
+        return datetime.now() - timedelta(hours=number)
+    return date
             
-            
\ No newline at end of file
+            
+def parse_mixed_dates(dates) -> pd.Series:
+    """
+    Parses a column of scraped dates into datetimes.
+
+    Absolute dates are parsed by pandas in one vectorized call; only the rows
+    it cannot read and that look relative ("5 mins ago") go through
+    `handle_mixed_dates`, instead of dispatching every row to it.
+
+    Args:
+        dates (iterable): The raw date strings.
+
+    Returns:
+        pd.Series: The parsed dates; unreadable values become NaT.
+    """
+    dates = pd.Series(dates, dtype="object")
+    parsed = pd.to_datetime(dates, format="mixed", errors="coerce")
+    relative = parsed.isna() & dates.str.contains("ago", na=False)
+    if relative.any():
+        parsed[relative] = pd.to_datetime(
+            dates[relative].map(handle_mixed_dates), errors="coerce")
+    return parsed
@@ -1,6 +1,17 @@
+import os
 import sys
+import tempfile
+import time
 import unittest
-from src.scraper.scrape import WebScraper
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pandas as pd
+import requests
+from src.scraper.scrape import WebScraper, TokenBucket
+from src.scraper.utils import (filter_new_urls, parse_mixed_dates, parse_dates,
+                               read_checkpoint, write_checkpoint, flatten_records,
+                               append_news, merge_previous_urls,
+                               merge_sorted_frames, save_csv)
 
 
 class TestWebScraper(unittest.TestCase):
@@ -25,6 +36,24 @@ class TestWebScraper(unittest.TestCase):
         items = self.web_scraper.extract_items(parsed_content, expression)
         self.assertEqual(len(items), 2)
 
+    def test_extract_items_lxml(self):
+        # The lxml-backed soup supports the same class-based extraction
+        web_scraper = WebScraper("lxml")
+        content = b"<html><body><p class='a'>Item 1</p><p class='a'>Item 2</p></body></html>"
+        parsed_content = web_scraper.parse_content(content)
+        items = web_scraper.extract_items(parsed_content, "a")
+        self.assertEqual([item.text for item in items], ["Item 1", "Item 2"])
+
+    def test_strainer_multi_class(self):
+        # Elements carrying several classes survive the strained parse
+        web_scraper = WebScraper("lxml")
+        content = (b"<html><body><h3 class='entry-title td-module-title'>T</h3>"
+                   b"<time class='entry-date updated'>D</time><p>x</p></body></html>")
+        strainer = web_scraper.make_strainer(["entry-title", "entry-date"])
+        parsed_content = web_scraper.parse_content(content, strainer)
+        self.assertEqual(len(web_scraper.extract_items(parsed_content, "entry-title")), 1)
+        self.assertEqual(len(web_scraper.extract_items(parsed_content, "entry-date")), 1)
+
     def test_scrape_url(self):
         # Test the scrape_url method
         url = "https://example.com"
@@ -32,6 +61,155 @@ class TestWebScraper(unittest.TestCase):
         items = self.web_scraper.scrape_url(url, expression)
         self.assertTrue(isinstance(items, list))
 
+    def test_token_bucket(self):
+        # Without a burst allowance, 3 tokens at 20/s take about 0.1s
+        bucket = TokenBucket(20, capacity=1)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_is_retryable(self):
+        # Connection errors and transient statuses are retried, 404 is not
+        self.assertTrue(self.web_scraper._is_retryable(requests.ConnectionError()))
+        for status_code, expected in [(503, True), (429, True), (404, False),
+                                      (403, False)]:
+            error = requests.HTTPError(response=self._response(status_code))
+            self.assertEqual(self.web_scraper._is_retryable(error), expected)
+
+    def test_retry_delay(self):
+        # Retry-After is honoured in seconds and as an HTTP date
+        error = requests.HTTPError(response=self._response(429, {"Retry-After": "7"}))
+        self.assertEqual(WebScraper._retry_delay(error, 0), 7.0)
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30),
+                                   usegmt=True)
+        error = requests.HTTPError(response=self._response(503, {"Retry-After": retry_at}))
+        self.assertTrue(25 <= WebScraper._retry_delay(error, 0) <= 30)
+        # Without the header the delay backs off exponentially with jitter
+        delay = WebScraper._retry_delay(requests.ConnectionError(), 2)
+        self.assertTrue(4 <= delay <= 5)
+
+    @staticmethod
+    def _response(status_code, headers=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        return response
+
+    def test_scrape_urls_invalid_expression(self):
+        # The expression is validated once, before any request is sent
+        with self.assertRaises(TypeError):
+            self.web_scraper.scrape_urls(["https://example.com"], 42)
+
+
+
+class TestScraperUtils(unittest.TestCase):
+    def test_filter_new_urls(self):
+        # Trailing-slash and casing variants count as already scraped
+        urls = ["https://a.com/1/", "https://a.com/2", "https://A.com/2", "https://a.com/3"]
+        existing = ["https://a.com/1", "https://a.com/3/"]
+        self.assertEqual(filter_new_urls(urls, existing), ["https://a.com/2"])
+
+    def test_parse_dates(self):
+        # Dates off the detected layout still parse through the fallback
+        dates = parse_dates(["March 5, 2024", "April 1, 2024", "2023-12-31"])
+        self.assertEqual([str(d.date()) for d in dates],
+                         ["2024-03-05", "2024-04-01", "2023-12-31"])
+
+    def test_parse_dates_slash_layouts(self):
+        # Slash dates are read month-first throughout, as format="mixed" does
+        dates = parse_dates(["05/03/2024", "12/31/2023"])
+        self.assertEqual([str(d.date()) for d in dates],
+                         ["2024-05-03", "2023-12-31"])
+        dates = parse_dates(["March 5, 2024", "05/03/2024"])
+        self.assertEqual([str(d.date()) for d in dates],
+                         ["2024-03-05", "2024-05-03"])
+
+    def test_parse_mixed_dates(self):
+        # Absolute and relative dates are both parsed; garbage becomes NaT
+        dates = parse_mixed_dates(["March 5, 2024", "3 hrs ago", "not a date"])
+        self.assertEqual(str(dates[0].date()), "2024-03-05")
+        self.assertFalse(pd.isna(dates[1]))
+        self.assertTrue(pd.isna(dates[2]))
+
+    def test_checkpoint(self):
+        # Batches accumulate in the checkpoint and read back in order
+        columns = ["url", "news"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "news.checkpoint.csv")
+            self.assertTrue(read_checkpoint(path, columns).empty)
+            write_checkpoint([["https://a.com/1", "one"]], path, columns)
+            write_checkpoint([["https://a.com/2", "two"]], path, columns)
+            df = read_checkpoint(path, columns)
+        self.assertEqual(df["url"].tolist(), ["https://a.com/1", "https://a.com/2"])
+
+    def test_flatten_records_empty(self):
+        # An empty collection still yields string-friendly columns
+        fields = {"link.to": "url", "contentUri": "media_type"}
+        df = flatten_records([], fields)
+        self.assertEqual(list(df.columns), ["url", "media_type"])
+        self.assertEqual(len("https://a.com" + df["url"]), 0)
+        self.assertEqual(len(df["media_type"].str.split("//").str[-1]), 0)
+
+    def test_flatten_records_missing_field(self):
+        # A field no record carries becomes NaN without breaking .str
+        df = flatten_records([{"link": {"to": "/news/1"}}],
+                             {"link.to": "url", "contentUri": "media_type"})
+        self.assertEqual(df["url"].tolist(), ["/news/1"])
+        self.assertTrue(df["media_type"].str.split("//").isna().all())
+
+    def test_append_news_unique_index(self):
+        # Rows appended over two runs continue the archive's numbering
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "news.csv")
+            pd.DataFrame({"url": ["a", "b"], "news": ["x", "y"]}).to_csv(path)
+            append_news(pd.DataFrame({"news": ["z"], "url": ["c"]}), path)
+            append_news(pd.DataFrame({"url": ["d", "e"], "news": ["v", "w"]}), path)
+            df = pd.read_csv(path, index_col=0)
+        self.assertEqual(df.index.tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(df["url"].tolist(), ["a", "b", "c", "d", "e"])
+
+    def test_append_news_new_file(self):
+        # The first write creates the file with its header
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "news.csv")
+            append_news(pd.DataFrame({"url": ["a"], "news": ["x"]}), path)
+            append_news(pd.DataFrame({"news": ["y"], "url": ["b"]}), path)
+            df = pd.read_csv(path, index_col=0)
+        self.assertEqual(list(df.columns), ["url", "news"])
+        self.assertEqual(df["news"].tolist(), ["x", "y"])
+
+    def test_merge_previous_urls(self):
+        # Saved entries are deduplicated and rediscovered ones are not repeated
+        urls_df = pd.DataFrame({"url": ["b", "c"], "title": ["B", "C"]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "urls.csv")
+            self.assertIs(merge_previous_urls(urls_df, path), urls_df)
+            pd.DataFrame({"url": ["a", "a", "b"], "title": ["A", "A", "old"],
+                          "extra": [1, 1, 2]}).to_csv(path)
+            merged = merge_previous_urls(urls_df, path)
+        self.assertEqual(merged["url"].tolist(), ["b", "c", "a"])
+        self.assertEqual(merged["title"].tolist(), ["B", "C", "A"])
+        self.assertEqual(list(merged.columns), ["url", "title"])
+
+    def test_merge_sorted_frames(self):
+        # Ties keep their input order, and the index is rebuilt
+        new = pd.DataFrame({"date": [3, 2], "url": ["n3", "n2"]}, index=[5, 6])
+        archive = pd.DataFrame({"date": [2, 1], "url": ["a2", "a1"]})
+        merged = merge_sorted_frames([new, archive])
+        self.assertEqual(merged["url"].tolist(), ["n3", "n2", "a2", "a1"])
+        self.assertEqual(merged.index.tolist(), [0, 1, 2, 3])
+
+    def test_save_csv(self):
+        # The file is replaced in place and no temporary file is left behind
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "news.csv")
+            save_csv(pd.DataFrame({"url": ["a"]}), path)
+            save_csv(pd.DataFrame({"url": ["b", "c"]}), path)
+            df = pd.read_csv(path, index_col=0)
+            self.assertEqual(os.listdir(tmp), ["news.csv"])
+        self.assertEqual(df["url"].tolist(), ["b", "c"])
+
 
 if __name__ == "__main__":
     unittest.main()